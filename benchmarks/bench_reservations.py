@@ -0,0 +1,146 @@
+"""
+Flash-sale simulation: many buyers hitting the last units of one product at
+once, with the read-modify-write that updateOp does (old path) versus the
+conditional UPDATE ... WHERE stock >= qty of /reservation/create (new path).
+
+    python -m benchmarks.bench_reservations [--buyers 500] [--stock 100]
+        [--qty 1] [--concurrency 50] [--products 3]
+
+Needs the Postgres database from DATABASE_URL (row locks and
+UPDATE ... FROM VALUES); it creates its own user, category and products
+and removes them afterwards. Asserts the new path never oversells.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.lib.db_con import async_engine
+from src.api.core.stock import reserve
+from src.api.models import Category, Product, Reservation, ReservationItem, User
+from src.api.models.reservationModel import BasketItem
+
+async_engine.echo = False
+
+
+async def setup(products: int, stock: int) -> tuple[int, int, list[int]]:
+    tag = uuid.uuid4().hex[:8]
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        user = User(
+            full_name="Bench Buyer", email=f"bench-{tag}@example.com", password="-"
+        )
+        category = Category(title=f"bench-{tag}")
+        session.add_all([user, category])
+        await session.flush()
+        rows = [
+            Product(
+                user_id=user.id,
+                category_id=category.id,
+                title=f"bench {tag} #{i}",
+                price=1,
+                stock=stock,
+                images=None,
+            )
+            for i in range(products)
+        ]
+        session.add_all(rows)
+        await session.commit()
+        return user.id, category.id, [row.id for row in rows]
+
+
+async def teardown(user_id: int, category_id: int, ids: list[int]):
+    statements = [
+        delete(ReservationItem).where(ReservationItem.product_id.in_(ids)),
+        delete(Reservation).where(Reservation.user_id == user_id),
+        delete(Product).where(Product.id.in_(ids)),
+        delete(Category).where(Category.id == category_id),
+        delete(User).where(User.id == user_id),
+    ]
+    async with AsyncSession(async_engine) as session:
+        for statement in statements:
+            await session.exec(statement)
+        await session.commit()
+
+
+async def old_buy(user_id: int, basket: list[BasketItem]) -> bool:
+    """session.get + check + updateOp-style assignment + commit."""
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        products = [await session.get(Product, item.product_id) for item in basket]
+        if any(p.stock < item.qty for p, item in zip(products, basket)):
+            return False
+        await asyncio.sleep(0)  # let other buyers read the same stock
+        for product, item in zip(products, basket):
+            product.stock = product.stock - item.qty
+        await session.commit()
+        return True
+
+
+async def new_buy(user_id: int, basket: list[BasketItem]) -> bool:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        try:
+            await reserve(session, user_id, basket)
+        except HTTPException:  # 409: not enough stock
+            return False
+        await session.commit()
+        return True
+
+
+async def run(buy, args) -> dict:
+    user_id, category_id, ids = await setup(args.products, args.stock)
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def buyer(n: int) -> bool:
+        # each basket takes every product, listed in a different order
+        order = ids[n % len(ids) :] + ids[: n % len(ids)]
+        basket = [BasketItem(product_id=id, qty=args.qty) for id in order]
+        async with gate:
+            return await buy(user_id, basket)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[buyer(n) for n in range(args.buyers)])
+    elapsed = time.perf_counter() - started
+
+    async with AsyncSession(async_engine) as session:
+        stocks = [(await session.get(Product, id)).stock for id in ids]
+    await teardown(user_id, category_id, ids)
+
+    sold = sum(results) * args.qty  # units of each product buyers were told they got
+    return {
+        "baskets": sum(results),
+        "sold": sold,
+        "left": stocks,
+        "oversold": max(sold - args.stock, 0),
+        # decrements lost to concurrent read-modify-write
+        "lost_updates": max(sold - (args.stock - min(stocks)), 0),
+        "rps": round(args.buyers / elapsed),
+    }
+
+
+async def main(args):
+    print(f"{args.buyers} buyers, {args.products} products x {args.stock} units")
+    for name, buy in (("read-modify-write", old_buy), ("conditional UPDATE", new_buy)):
+        try:
+            result = await run(buy, args)
+        except Exception as e:  # e.g. deadlock between unordered baskets
+            print(f"{name:>20}: failed with {type(e).__name__}: {e}")
+            continue
+        print(f"{name:>20}: {result}")
+        if buy is new_buy:
+            assert result["oversold"] == result["lost_updates"] == 0, "oversold"
+            assert all(stock >= 0 for stock in result["left"]), "negative stock"
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--buyers", type=int, default=500)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--qty", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--products", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,125 @@
+"""
+N+1 guard for the list pipeline: drives /product/list pages (ProductRead,
+which embeds user and category) through listRecords with LIST_QUERY_BUDGET
+set, so query_budget raises QueryBudgetExceeded if the eager-load planner
+ever stops covering a relationship. The same page loaded lazily is
+counted for contrast.
+
+    LIST_QUERY_BUDGET=2 python -m benchmarks.check_query_budget [--products 50]
+
+Needs the database from DATABASE_URL; it creates its own user, categories
+and products and removes them afterwards. Budget defaults to 2 (count +
+page).
+"""
+
+import argparse
+import os
+import uuid
+
+os.environ.setdefault("LIST_QUERY_BUDGET", "2")
+
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from src.config import LIST_QUERY_BUDGET
+from src.lib.db_con import QueryBudgetExceeded, engine, query_budget
+from src.api.core.operation import listop, listParams, listRecords
+from src.api.models import Category, Product, User
+from src.api.models.productModel import ProductRead
+
+engine.echo = False
+
+SEARCH_FIELDS = ["title", "description", "category.title"]
+CASES = {
+    "first page": {},
+    "page 2, sorted": {"page": 2, "sort": "-created_at"},
+    "cursor": {"pagination": "cursor", "sort": "price", "limit": 20},
+    "sparse fields": {"fields": "id,title,category.title"},
+}
+
+
+def setup(products: int) -> tuple[int, list[int], list[int]]:
+    """One user, a parent and a child category, products split across both."""
+    tag = uuid.uuid4().hex[:8]
+    with Session(engine) as session:
+        user = User(full_name="Budget Check", email=f"budget-{tag}@example.com", password="-")
+        parent = Category(title=f"budget-{tag}")
+        session.add_all([user, parent])
+        session.flush()
+        child = Category(title=f"budget-{tag}-child", parent_id=parent.id)
+        session.add(child)
+        session.flush()
+        rows = [
+            Product(
+                user_id=user.id,
+                category_id=(child if i % 2 else parent).id,
+                title=f"budget {tag} #{i}",
+                price=i % 7,
+                images=None,
+            )
+            for i in range(products)
+        ]
+        session.add_all(rows)
+        session.commit()
+        return user.id, [child.id, parent.id], [row.id for row in rows]
+
+
+def teardown(user_id: int, category_ids: list[int], ids: list[int]):
+    statements = [
+        delete(Product).where(Product.id.in_(ids)),
+        *[delete(Category).where(Category.id == id) for id in category_ids],
+        delete(User).where(User.id == user_id),
+    ]
+    with Session(engine) as session:
+        for statement in statements:
+            session.exec(statement)
+        session.commit()
+
+
+def eager_page(query_params: dict):
+    """listRecords as /product/list calls it; raises past the budget."""
+    return listRecords(
+        query_params=query_params,
+        searchFields=SEARCH_FIELDS,
+        Model=Product,
+        Schema=ProductRead,
+    )
+
+
+def lazy_queries(query_params: dict) -> int:
+    """Statements for the same page without eager options (lazy loads)."""
+    with Session(engine) as session:
+        with query_budget(session, 10**6) as statements:
+            params = listParams(query_params, ProductRead)
+            params["fields"] = None
+            result = listop(session, Model=Product, searchFields=SEARCH_FIELDS, **params)
+            [ProductRead.model_validate(row) for row in result["data"]]
+        return len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=50)
+    args = parser.parse_args()
+
+    failures = 0
+    user_id, category_ids, ids = setup(args.products)
+    try:
+        print(f"budget {LIST_QUERY_BUDGET} queries per list")
+        for name, query_params in CASES.items():
+            try:
+                eager_page(query_params)
+                status = "ok"
+            except QueryBudgetExceeded as error:
+                failures += 1
+                status = f"FAILED\n{error}"
+            print(f"{name:>16}: {status}  (lazy: {lazy_queries(query_params)} queries)")
+    finally:
+        teardown(user_id, category_ids, ids)
+
+    if failures:
+        raise SystemExit(f"{failures} list(s) over budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""reservation item product cascade
+
+Revision ID: 2c8e5f1a7b93
+Revises: 9d4a7c2e1f58
+Create Date: 2026-10-18 18:32:14.507216
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2c8e5f1a7b93"
+down_revision: Union[str, Sequence[str], None] = "9d4a7c2e1f58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # deleting a product that was ever reserved failed on this foreign key
+    op.drop_constraint(
+        "reservation_item_product_id_fkey", "reservation_item", type_="foreignkey"
+    )
+    op.create_foreign_key(
+        "reservation_item_product_id_fkey",
+        "reservation_item",
+        "product",
+        ["product_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "reservation_item_product_id_fkey", "reservation_item", type_="foreignkey"
+    )
+    op.create_foreign_key(
+        "reservation_item_product_id_fkey",
+        "reservation_item",
+        "product",
+        ["product_id"],
+        ["id"],
+    )
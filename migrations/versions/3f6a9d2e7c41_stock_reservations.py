@@ -0,0 +1,94 @@
+"""stock reservations
+
+Revision ID: 3f6a9d2e7c41
+Revises: e1b7c2d94f60
+Create Date: 2026-10-18 16:40:27.118934
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6a9d2e7c41"
+down_revision: Union[str, Sequence[str], None] = "e1b7c2d94f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "reservation",
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status", sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False
+        ),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_reservation_user_id"), "reservation", ["user_id"], unique=False
+    )
+    op.create_index(
+        "ix_reservation_held_expires_at",
+        "reservation",
+        ["expires_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'held'"),
+    )
+    op.create_table(
+        "reservation_item",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("reservation_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("qty", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["product_id"],
+            ["product.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["reservation_id"],
+            ["reservation.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_reservation_item_product_id"),
+        "reservation_item",
+        ["product_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_reservation_item_reservation_id"),
+        "reservation_item",
+        ["reservation_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_reservation_item_reservation_id"), table_name="reservation_item"
+    )
+    op.drop_index(op.f("ix_reservation_item_product_id"), table_name="reservation_item")
+    op.drop_table("reservation_item")
+    op.drop_index(
+        "ix_reservation_held_expires_at",
+        table_name="reservation",
+        postgresql_where=sa.text("status = 'held'"),
+    )
+    op.drop_index(op.f("ix_reservation_user_id"), table_name="reservation")
+    op.drop_table("reservation")
@@ -0,0 +1,85 @@
+"""product rating aggregates
+
+Revision ID: 5d2e8b7c9a14
+Revises: 7873d1cb03ce
+Create Date: 2026-10-18 11:20:37.402118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2e8b7c9a14"
+down_revision: Union[str, Sequence[str], None] = "7873d1cb03ce"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AGGREGATES = [
+    "rating_count",
+    "rating_sum",
+    "rating_1",
+    "rating_2",
+    "rating_3",
+    "rating_4",
+    "rating_5",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in AGGREGATES:
+        op.add_column(
+            "product",
+            sa.Column(column, sa.Integer(), server_default="0", nullable=False),
+        )
+    op.add_column(
+        "product",
+        sa.Column(
+            "avg_rating",
+            sa.Float(),
+            sa.Computed(
+                "CASE WHEN rating_count > 0 "
+                "THEN CAST(rating_sum AS FLOAT) / rating_count END",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+    # Backfill from existing ratings
+    op.execute(
+        """
+        UPDATE product
+        SET rating_count = totals.rating_count,
+            rating_sum = totals.rating_sum,
+            rating_1 = totals.rating_1,
+            rating_2 = totals.rating_2,
+            rating_3 = totals.rating_3,
+            rating_4 = totals.rating_4,
+            rating_5 = totals.rating_5
+        FROM (
+            SELECT product_id,
+                   count(*) AS rating_count,
+                   sum(score) AS rating_sum,
+                   count(*) FILTER (WHERE score = 1) AS rating_1,
+                   count(*) FILTER (WHERE score = 2) AS rating_2,
+                   count(*) FILTER (WHERE score = 3) AS rating_3,
+                   count(*) FILTER (WHERE score = 4) AS rating_4,
+                   count(*) FILTER (WHERE score = 5) AS rating_5
+            FROM rating
+            GROUP BY product_id
+        ) AS totals
+        WHERE product.id = totals.product_id;
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("product", "avg_rating")
+    for column in reversed(AGGREGATES):
+        op.drop_column("product", column)
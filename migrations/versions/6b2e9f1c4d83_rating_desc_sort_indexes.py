@@ -0,0 +1,61 @@
+"""rating desc sort indexes
+
+Revision ID: 6b2e9f1c4d83
+Revises: 3f6a9d2e7c41
+Create Date: 2026-10-18 17:52:13.406218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6b2e9f1c4d83"
+down_revision: Union[str, Sequence[str], None] = "3f6a9d2e7c41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# applySort orders -created_at / -score as (column DESC NULLS LAST, id DESC);
+# a backward scan of an ASC index gives DESC NULLS FIRST and cannot serve it
+INDEXES = {
+    "ix_rating_product_created": "created_at",
+    "ix_rating_product_score": "score",
+}
+
+
+def _recreate(name: str, columns: list):
+    op.drop_index(
+        name, table_name="rating", postgresql_concurrently=True, if_exists=True
+    )
+    op.create_index(
+        name,
+        "rating",
+        columns,
+        unique=False,
+        postgresql_concurrently=True,
+        if_not_exists=True,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES.items():
+            _recreate(
+                name,
+                [
+                    "product_id",
+                    sa.text(f"{column} DESC NULLS LAST"),
+                    sa.text("id DESC"),
+                ],
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES.items():
+            _recreate(name, ["product_id", column, "id"])
@@ -0,0 +1,75 @@
+"""trigram & prefix search indexes
+
+Revision ID: 7873d1cb03ce
+Revises: fa3941e7ed98
+Create Date: 2026-10-18 10:02:41.530917
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7873d1cb03ce"
+down_revision: Union[str, Sequence[str], None] = "fa3941e7ed98"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> columns declared with searchable_indexes() on the models
+SEARCHABLE_COLUMNS = {
+    "user": ["email", "full_name", "phone"],
+    "product": ["title"],
+    "category": ["title"],
+    "user_role": ["title"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY keeps the tables writable while large indexes build
+    with op.get_context().autocommit_block():
+        for table, columns in SEARCHABLE_COLUMNS.items():
+            for column in columns:
+                op.create_index(
+                    f"ix_{table}_{column}_trgm",
+                    table,
+                    [column],
+                    unique=False,
+                    postgresql_using="gin",
+                    postgresql_ops={column: "gin_trgm_ops"},
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+                op.create_index(
+                    f"ix_{table}_{column}_prefix",
+                    table,
+                    [column],
+                    unique=False,
+                    postgresql_ops={column: "text_pattern_ops"},
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, columns in SEARCHABLE_COLUMNS.items():
+            for column in columns:
+                op.drop_index(
+                    f"ix_{table}_{column}_prefix",
+                    table_name=table,
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+                op.drop_index(
+                    f"ix_{table}_{column}_trgm",
+                    table_name=table,
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
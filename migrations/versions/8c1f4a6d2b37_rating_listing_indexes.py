@@ -0,0 +1,51 @@
+"""rating listing indexes
+
+Revision ID: 8c1f4a6d2b37
+Revises: 5d2e8b7c9a14
+Create Date: 2026-10-18 11:48:09.215533
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c1f4a6d2b37"
+down_revision: Union[str, Sequence[str], None] = "5d2e8b7c9a14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# /product/rating/read pages one product's ratings by date or score (+ id)
+INDEXES = {
+    "ix_rating_product_created": ["product_id", "created_at", "id"],
+    "ix_rating_product_score": ["product_id", "score", "id"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                "rating",
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name="rating",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
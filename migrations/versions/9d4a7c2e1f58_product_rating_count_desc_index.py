@@ -0,0 +1,44 @@
+"""product rating count desc index
+
+Revision ID: 9d4a7c2e1f58
+Revises: 6b2e9f1c4d83
+Create Date: 2026-10-18 17:58:40.771352
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4a7c2e1f58"
+down_revision: Union[str, Sequence[str], None] = "6b2e9f1c4d83"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # sort=-rating_count: same ORDER BY as applySort, like ix_product_avg_rating
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_product_rating_count_desc",
+            "product",
+            [sa.text("rating_count DESC NULLS LAST"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_product_rating_count_desc",
+            table_name="product",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
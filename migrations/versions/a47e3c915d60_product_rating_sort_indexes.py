@@ -0,0 +1,53 @@
+"""product rating sort indexes
+
+Revision ID: a47e3c915d60
+Revises: 8c1f4a6d2b37
+Create Date: 2026-10-18 12:05:51.734290
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a47e3c915d60"
+down_revision: Union[str, Sequence[str], None] = "8c1f4a6d2b37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same ORDER BY as applySort: (column DESC NULLS LAST, id DESC)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_product_avg_rating",
+            "product",
+            [sa.text("avg_rating DESC NULLS LAST"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_product_rating_count",
+            "product",
+            ["rating_count", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in ("ix_product_rating_count", "ix_product_avg_rating"):
+            op.drop_index(
+                name,
+                table_name="product",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
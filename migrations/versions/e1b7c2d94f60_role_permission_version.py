@@ -0,0 +1,32 @@
+"""role permission version
+
+Revision ID: e1b7c2d94f60
+Revises: a47e3c915d60
+Create Date: 2026-10-18 15:02:11.734520
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e1b7c2d94f60"
+down_revision: Union[str, Sequence[str], None] = "a47e3c915d60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "user_role",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user_role", "version")
@@ -0,0 +1,117 @@
+"""product full-text search vector
+
+Revision ID: fa3941e7ed98
+Revises: 450dde4f7e7e
+Create Date: 2026-10-18 09:12:04.118230
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "fa3941e7ed98"
+down_revision: Union[str, Sequence[str], None] = "450dde4f7e7e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "product", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True)
+    )
+
+    # Weighted document: product title (A) > category title (B) > description (C)
+    op.execute(
+        """
+        CREATE FUNCTION product_search_document(
+            title text, description text, category_title text
+        ) RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(category_title, '')), 'B')
+                || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        $$;
+        """
+    )
+
+    # Product rows: recompute on insert and whenever an indexed field changes
+    op.execute(
+        """
+        CREATE FUNCTION product_search_vector_refresh() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := product_search_document(
+                NEW.title,
+                NEW.description,
+                (SELECT title FROM category WHERE id = NEW.category_id)
+            );
+            RETURN NEW;
+        END
+        $$;
+
+        CREATE TRIGGER product_search_vector_refresh
+        BEFORE INSERT OR UPDATE OF title, description, category_id ON product
+        FOR EACH ROW EXECUTE FUNCTION product_search_vector_refresh();
+        """
+    )
+
+    # Category renames: refresh the products filed under that category
+    op.execute(
+        """
+        CREATE FUNCTION category_search_vector_refresh() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE product
+            SET search_vector = product_search_document(
+                product.title, product.description, NEW.title
+            )
+            WHERE product.category_id = NEW.id;
+            RETURN NULL;
+        END
+        $$;
+
+        CREATE TRIGGER category_search_vector_refresh
+        AFTER UPDATE OF title ON category
+        FOR EACH ROW WHEN (OLD.title IS DISTINCT FROM NEW.title)
+        EXECUTE FUNCTION category_search_vector_refresh();
+        """
+    )
+
+    # Backfill existing rows
+    op.execute(
+        """
+        UPDATE product
+        SET search_vector = product_search_document(
+            product.title, product.description, category.title
+        )
+        FROM category
+        WHERE category.id = product.category_id;
+        """
+    )
+
+    op.create_index(
+        "ix_product_search_vector",
+        "product",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_product_search_vector", table_name="product", postgresql_using="gin"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS category_search_vector_refresh ON category;"
+        "DROP TRIGGER IF EXISTS product_search_vector_refresh ON product;"
+        "DROP FUNCTION IF EXISTS category_search_vector_refresh();"
+        "DROP FUNCTION IF EXISTS product_search_vector_refresh();"
+        "DROP FUNCTION IF EXISTS product_search_document(text, text, text);"
+    )
+    op.drop_column("product", "search_vector")
@@ -1,10 +1,26 @@
-from .operation import updateOp, listop, listRecords
+from .operation import (
+    updateOp,
+    listop,
+    listopAsync,
+    listRecords,
+    listRecordsAsync,
+    exportRecords,
+    exportRecordsAsync,
+    validateAsync,
+)
 from .response import api_response, raiseExceptions
-from .dependencies import GetSession, requireSignin, requirePermission, requireAdmin
+from .dependencies import (
+    GetSession,
+    AsyncGetSession,
+    requireSignin,
+    requirePermission,
+    requireAdmin,
+)
 
 
 __all__ = [
     "GetSession",
+    "AsyncGetSession",
     "requireSignin",
     "requirePermission",
     "requireAdmin",
@@ -12,5 +28,10 @@ __all__ = [
     "raiseExceptions",
     "updateOp",
     "listop",
+    "listopAsync",
     "listRecords",
+    "listRecordsAsync",
+    "exportRecords",
+    "exportRecordsAsync",
+    "validateAsync",
 ]
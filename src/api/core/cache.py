@@ -0,0 +1,174 @@
+from collections import OrderedDict
+import json
+from threading import Lock
+import time
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
+
+from fastapi import Response
+
+from src.config import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL
+
+
+class TTLCache:
+    """
+    LRU cache whose entries also expire after `ttl` seconds.
+    Bounded by `max_size` measured with `sizeof` (entries by default, bytes
+    for the response cache). Entries carry tags so writes can drop exactly
+    the entries they affect; per-tag generations stop a value computed before
+    an invalidation from being stored after it.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        sizeof: Callable[[Any], int] = lambda value: 1,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.size = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, expires, size, tags)
+        self._generations: dict[str, int] = {}
+        self._lock = Lock()
+        self.hits = self.misses = self.evictions = 0
+        self.expirations = self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[1] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def generation(self, tags: Iterable[str]) -> tuple:
+        """Snapshot taken before computing a value, handed back to set()."""
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def set(
+        self,
+        key: Hashable,
+        value,
+        tags: Iterable[str] = (),
+        generation: Optional[tuple] = None,
+        ttl: Optional[float] = None,
+    ) -> bool:
+        tags = tuple(tags)
+        size = self.sizeof(value)
+        if not self.enabled or size > self.max_size:
+            return False
+        with self._lock:
+            # an invalidation ran while the value was computed: it may be stale
+            current = tuple(self._generations.get(tag, 0) for tag in tags)
+            if generation is not None and generation != current:
+                return False
+            if key in self._entries:
+                self._drop(key)
+            expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (value, expires, size, tags)
+            self.size += size
+            while self.size > self.max_size:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry carrying any of `tags`."""
+        tags = set(tags)
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [k for k, e in self._entries.items() if tags.intersection(e[3])]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size": self.size,
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.size -= entry[2]
+
+
+# Rendered list/read responses (body bytes), per worker process.
+# Other workers only see a write once the TTL runs out, keep it short.
+response_cache = TTLCache(
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_TTL,
+    sizeof=lambda entry: len(entry[1]) + 200,
+)
+
+
+def cache_key(
+    route: str, query_params: Optional[dict] = None, user: Optional[dict] = None
+) -> tuple:
+    """
+    ("product:list", {...}, user) -> hashable key. Unset params are dropped so
+    ?page=1 and the defaults share an entry; callers are told apart by role
+    and permission set only (not user id), so same-permission users share.
+    """
+    params = {k: v for k, v in (query_params or {}).items() if v is not None}
+    identity = None
+    if user is not None:
+        identity = (user.get("role"), frozenset(user.get("permissions") or ()))
+    return route, json.dumps(params, sort_keys=True, default=str), identity
+
+
+async def cachedResponse(
+    key: tuple, tags: Iterable[str], produce: Callable[[], Awaitable[Response]]
+) -> Response:
+    """Serve `key` from the cache, else await produce() and store 200 responses."""
+    if not response_cache.enabled:
+        return await produce()
+
+    tags = tuple(tags)
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation(tags)
+        response = await produce()
+        if response.status_code != 200:
+            return response
+        entry = (response.status_code, bytes(response.body), response.media_type)
+        response_cache.set(key, entry, tags, generation)
+        return response
+
+    status_code, body, media_type = entry
+    return Response(content=body, status_code=status_code, media_type=media_type)
+
+
+def invalidate(*tags: str) -> int:
+    """Call after a committed write, e.g. invalidate("product", f"product:{id}")."""
+    return response_cache.invalidate(*tags)
@@ -0,0 +1,189 @@
+from dataclasses import dataclass, field
+from threading import RLock
+import time
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from src.config import CATEGORY_TREE_TTL
+from src.api.models.categoryModel import Category, CategoryRead, CategoryReadNested
+
+
+@dataclass(slots=True)
+class TreeNode:
+    item: CategoryRead
+    parent_id: Optional[int]  # effective parent: None for roots, orphans, cycles
+    children: list[int] = field(default_factory=list)
+    depth: int = 0
+    ancestors: tuple[int, ...] = ()  # root ... parent
+
+
+class TreeIndex:
+    """
+    Whole category table held in memory: id -> node with children, depth and
+    ancestor path. Loaded with one query, patched in place by the category
+    write routes and reloaded after `ttl` seconds so writes made by other
+    worker processes show up.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.nodes: dict[int, TreeNode] = {}
+        self.roots: list[int] = []
+        self.loaded_at: Optional[float] = None
+        self.version: Optional[tuple] = None
+        self._lock = RLock()
+
+    # -- loading -------------------------------------------------------------
+
+    def ensure(self, session: Session, version: Optional[tuple] = None) -> "TreeIndex":
+        """
+        Load on first use, once the TTL ran out or when `version` is not the
+        one the index was loaded at (sync; run_sync from async).
+        """
+        expired = (
+            self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+        )
+        if expired or (version is not None and version != self.version):
+            self.rebuild(session.exec(select(Category)).all(), version)
+        return self
+
+    def rebuild(self, rows, version: Optional[tuple] = None):
+        with self._lock:
+            self.version = version
+            self.nodes = {
+                row.id: TreeNode(CategoryRead.model_validate(row), row.parent_id)
+                for row in rows
+            }
+            self._link()
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Force a reload on the next read."""
+        with self._lock:
+            self.loaded_at = None
+
+    def _link(self):
+        """Children lists, roots, depth and ancestors in one O(n) pass."""
+        for node in self.nodes.values():
+            node.children.clear()
+        for id, node in self.nodes.items():
+            # start from the stored parent_id, a previous pass may have cut it
+            node.parent_id = node.item.parent_id
+            parent = self.nodes.get(node.parent_id)
+            if parent is None or node.parent_id == id:
+                node.parent_id = None
+            else:
+                parent.children.append(id)
+
+        self.roots = sorted(id for id, n in self.nodes.items() if n.parent_id is None)
+        seen = self._walk(self.roots)
+        # nodes never reached sit on a parent_id cycle: cut it, they become roots
+        for id in sorted(set(self.nodes) - seen):
+            if id not in seen:
+                node = self.nodes[id]
+                self.nodes[node.parent_id].children.remove(id)
+                node.parent_id = None
+                self.roots.append(id)
+                seen |= self._walk([id])
+
+    def _walk(self, start: list[int]) -> set[int]:
+        """Sort children, set depth/ancestors below `start` (iterative DFS)."""
+        seen = set()
+        stack = []
+        for id in start:
+            node = self.nodes[id]
+            node.depth, node.ancestors = 0, ()
+            stack.append(id)
+        while stack:
+            id = stack.pop()
+            seen.add(id)
+            node = self.nodes[id]
+            node.children.sort()
+            for child_id in node.children:
+                child = self.nodes[child_id]
+                if child_id in seen:
+                    continue
+                child.depth = node.depth + 1
+                child.ancestors = (*node.ancestors, id)
+                stack.append(child_id)
+        return seen
+
+    # -- writes (call after commit) ------------------------------------------
+
+    def upsert(self, row: Category):
+        """Category created or updated (title, parent_id...)."""
+        with self._lock:
+            if self.loaded_at is None:
+                return  # not loaded yet, the next read loads fresh rows
+            node = self.nodes.get(row.id)
+            if node is None:
+                self.nodes[row.id] = TreeNode(
+                    CategoryRead.model_validate(row), row.parent_id
+                )
+            else:
+                node.item = CategoryRead.model_validate(row)
+            self._link()
+
+    def remove(self, id: int) -> list[int]:
+        """Drop a category and its subtree; returns the removed ids."""
+        with self._lock:
+            removed = self.descendants(id, include_self=True)
+            for node_id in removed:
+                self.nodes.pop(node_id, None)
+            if removed:
+                self._link()
+            return removed
+
+    # -- reads -------------------------------------------------------------
+
+    def node(self, id: int) -> Optional[TreeNode]:
+        return self.nodes.get(id)
+
+    def descendants(self, id: int, include_self: bool = False) -> list[int]:
+        with self._lock:
+            if id not in self.nodes:
+                return []
+            ids, stack = [], [id]
+            while stack:
+                node_id = stack.pop()
+                ids.append(node_id)
+                stack.extend(reversed(self.nodes[node_id].children))
+            return ids if include_self else ids[1:]
+
+    def subtree(self, id: int, max_depth: Optional[int] = None):
+        """CategoryReadNested for `id` with its children (all levels by default)."""
+        with self._lock:
+            if id not in self.nodes:
+                return None
+            return self._render(id, max_depth)
+
+    def tree(self, root_ids: Optional[list[int]] = None, max_depth=None) -> list:
+        with self._lock:
+            ids = self.roots if root_ids is None else root_ids
+            return [self._render(id, max_depth) for id in ids if id in self.nodes]
+
+    def breadcrumbs(self, id: int) -> Optional[list[CategoryRead]]:
+        """Root ... category itself."""
+        with self._lock:
+            node = self.nodes.get(id)
+            if node is None:
+                return None
+            return [self.nodes[a].item for a in node.ancestors] + [node.item]
+
+    def _render(self, id: int, max_depth: Optional[int], level: int = 0):
+        node = self.nodes[id]
+        children = []
+        if max_depth is None or level < max_depth:
+            children = [
+                self._render(child_id, max_depth, level + 1)
+                for child_id in node.children
+            ]
+        # rows were validated when indexed, skip validating them again
+        return CategoryReadNested.model_construct(
+            **dict(node.item), children=children
+        )
+
+
+# Process-wide index used by the category routes
+category_tree = TreeIndex(CATEGORY_TREE_TTL)
@@ -0,0 +1,170 @@
+import hashlib
+import json
+from typing import Optional
+
+from fastapi import Response
+from sqlalchemy import inspect
+from sqlmodel import Session, SQLModel, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import HTTP_CACHE_MAX_AGE
+from src.api.core.operation import listParams, listopAsync, listStatement
+from src.api.core.operation.projection_helper import check_query_paths
+from src.api.core.operation.eager_helper import nested_schema
+
+# Authenticated responses: clients/CDN keep them but revalidate with the ETag
+PRIVATE_CACHE = "private, no-cache"
+# Public catalog pages: shared caches may serve them for HTTP_CACHE_MAX_AGE
+PUBLIC_CACHE = f"public, max-age={HTTP_CACHE_MAX_AGE}, must-revalidate"
+
+
+def _changed_at(Model):
+    """Last change of a row: updated_at, or created_at if never updated."""
+    return func.coalesce(Model.updated_at, Model.created_at)
+
+
+def _related(Model, Schema):
+    """Relationships the Schema renders -> [(name, related Model, is_collection)]"""
+    relationships = inspect(Model).relationships
+    related = []
+    for name, field in (Schema.model_fields.items() if Schema else []):
+        relationship = relationships.get(name)
+        nested, is_collection = nested_schema(field.annotation)
+        if relationship is not None and nested is not None:
+            related.append((name, relationship.mapper.class_, is_collection))
+    return related
+
+
+def _table_version(Model):
+    return select(func.count(), func.max(_changed_at(Model))).select_from(Model)
+
+
+def recordVersionStatements(Model: type[SQLModel], id, Schema=None) -> list:
+    """
+    (id, updated_at) of the row and of each many-to-one row the Schema
+    embeds; embedded collections (e.g. category children) use their table's
+    count + max(updated_at).
+    """
+    columns = [Model.id, _changed_at(Model)]
+    joins, statements = [], []
+    for name, Related, is_collection in _related(Model, Schema):
+        if is_collection:
+            statements.append(_table_version(Related))
+        else:
+            columns.append(_changed_at(Related))
+            joins.append(getattr(Model, name))
+
+    statement = select(*columns).select_from(Model)
+    for relationship in joins:
+        statement = statement.outerjoin(relationship)
+    return [statement.where(Model.id == id), *statements]
+
+
+def listVersionStatements(
+    Model: type[SQLModel], query_params: dict, searchFields: list[str], Schema=None
+) -> list:
+    """count + max(updated_at) over the filtered set, plus every embedded table."""
+    check_query_paths(query_params, Schema)
+    filters = {
+        "searchTerm": query_params.get("searchTerm"),
+        "columnFilters": query_params.get("columnFilters"),
+        "dateRange": query_params.get("dateRange"),
+        "numberRange": query_params.get("numberRange"),
+    }
+    filtered = listStatement(Model, filters, searchFields).order_by(None)
+    filtered = filtered.with_only_columns(
+        _changed_at(Model).label("changed_at")
+    ).subquery()
+    statements = [select(func.count(), func.max(filtered.c.changed_at))]
+    for _, Related, _ in _related(Model, Schema):
+        statements.append(_table_version(Related))
+    return statements
+
+
+def _page_fields(Model, Schema) -> list[str]:
+    """id + change columns of the row and of each many-to-one row the Schema embeds."""
+    fields = ["id", "created_at", "updated_at"]
+    for name, _, is_collection in _related(Model, Schema):
+        if not is_collection:
+            fields += [f"{name}.created_at", f"{name}.updated_at"]
+    return fields
+
+
+async def listPageETagAsync(
+    session: AsyncSession,
+    Model: type[SQLModel],
+    query_params: dict,
+    searchFields: list[str],
+    Schema,
+) -> str:
+    """
+    ETag of the page a list request returns: the same filters, sort,
+    pagination and countMode as the body, selecting only the change columns
+    of the page rows and their embedded many-to-one rows. A 304 costs one
+    narrow page query plus the count the client asked for, never a
+    full-table aggregate. Embedded collections are not covered (see
+    listVersionStatements).
+    """
+    params = listParams(query_params, Schema)
+    params["fields"] = _page_fields(Model, Schema)
+    result = await listopAsync(
+        session, Model=Model, searchFields=searchFields, **params
+    )
+    params = {k: v for k, v in query_params.items() if v is not None}
+    return makeETag(
+        [list(row) for row in result["data"]], result["total"], sorted(params.items())
+    )
+
+
+def makeETag(*parts) -> str:
+    """Strong validator: same parts -> same (byte-identical) body."""
+    digest = hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def rowsETag(rows: list, query_params: Optional[dict] = None) -> Optional[str]:
+    if rows[0] is None:  # row not found, the handler answers 404
+        return None
+    params = {k: v for k, v in (query_params or {}).items() if v is not None}
+    return makeETag([list(row) for row in rows], sorted(params.items()))
+
+
+def versionETag(session: Session, statements: list, query_params=None):
+    return rowsETag([session.exec(s).first() for s in statements], query_params)
+
+
+async def versionRowsAsync(session: AsyncSession, statements: list) -> list:
+    """The version rows themselves, for callers that also check a local copy."""
+    return [(await session.exec(s)).first() for s in statements]
+
+
+async def versionETagAsync(session: AsyncSession, statements: list, query_params=None):
+    return rowsETag(await versionRowsAsync(session, statements), query_params)
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def notModified(
+    etag: Optional[str], if_none_match: Optional[str], cache_control=PRIVATE_CACHE
+) -> Optional[Response]:
+    """304 (nothing queried or serialized past the version check) or None."""
+    if etag and _matches(if_none_match, etag):
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+        )
+    return None
+
+
+def withETag(
+    response: Response, etag: Optional[str], cache_control=PRIVATE_CACHE
+) -> Response:
+    if etag and response.status_code == 200:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
+    return response
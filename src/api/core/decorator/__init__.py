@@ -1,5 +1,7 @@
 from functools import wraps
+import inspect
 import re
+from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError, OperationalError
 from pydantic import ValidationError
@@ -17,7 +19,13 @@ def handle_async_wrapper(func):
     async def wrapper(*args, **kwargs):
         try:
             result = func(*args, **kwargs)
+            # async route handlers return a coroutine
+            if inspect.isawaitable(result):
+                result = await result
             return result
+        except HTTPException:
+            # api_response / raiseExceptions already shaped these
+            raise
         except ValidationError as ve:
             # Pydantic validation issues
             return api_response(
@@ -1,18 +1,22 @@
 from typing import Annotated, Any, Dict, Optional
 
-from fastapi import Depends, Query
+from fastapi import Depends, Header, Query
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.lib.db_con import get_session
+from src.lib.db_con import get_async_session, get_session
 from src.api.core.security import require_permission, require_signin, require_admin
 
 from src.api.core.dependencies.query_params import list_query_params
 
 GetSession = Annotated[Session, Depends(get_session)]
+AsyncGetSession = Annotated[AsyncSession, Depends(get_async_session)]
 
 requireSignin = Annotated[dict, Depends(require_signin)]
 requireAdmin = Annotated[dict, Depends(require_admin)]
 ListQueryParams = Annotated[dict, Depends(list_query_params)]
+# conditional GET: `if_none_match: IfNoneMatch = None`
+IfNoneMatch = Annotated[Optional[str], Header(include_in_schema=False)]
 
 
 def requirePermission(permission: str):
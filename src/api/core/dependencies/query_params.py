@@ -9,15 +9,37 @@ class list_query_params:
             None, description="Example : ['created_at', '01-01-2025', '01-12-2025']"
         ),
         numberRange: Optional[str] = Query(
-            None, description="Example : ['amount', 0, 100000]"
+            None,
+            description="Example : ['amount', 0, 100000] or ['avg_rating', 4, 5]",
         ),
         searchTerm: str | None = Query(None, description="Search term"),
         columnFilters: Optional[str] = Query(
-            None, description="Example : '[['name','car'],['description','product']]"
+            None,
+            description="Example : '[['name','car'],['email','prefix','ann']]' (ops: contains, prefix, eq)",
         ),
         page: int = Query(1, description="Page number"),
         skip: int = Query(0, description="Number of items to skip"),
         limit: int = Query(10, description="Number of items to return"),
+        countMode: str = Query(
+            "exact",
+            description="How total is computed : 'exact', 'capped', 'estimate' or 'none'",
+        ),
+        countCap: Optional[int] = Query(
+            None, description="Upper bound for countMode='capped'"
+        ),
+        sort: Optional[str] = Query(
+            None,
+            description="Example : 'price', '-created_at' or '-avg_rating' (id breaks ties)",
+        ),
+        pagination: str = Query(
+            "offset", description="'offset' (page/skip) or 'cursor' (keyset)"
+        ),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor returned by the previous page"
+        ),
+        fields: Optional[str] = Query(
+            None, description="Example : 'title,price,category.title' (id always included)"
+        ),
     ):
         self.dateRange = dateRange
         self.skip = skip
@@ -26,3 +48,9 @@ class list_query_params:
         self.columnFilters = columnFilters
         self.page = page
         self.numberRange = numberRange
+        self.countMode = countMode
+        self.countCap = countCap
+        self.sort = sort
+        self.pagination = pagination
+        self.cursor = cursor
+        self.fields = fields
@@ -1,11 +1,38 @@
 from datetime import datetime, timezone
 from fastapi import Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
+from src.config import DB_MODE, EXPORT_BATCH_SIZE, LIST_COUNT_CAP, LIST_QUERY_BUDGET
 from src.api.core.response import api_response
-from src.lib.db_con import get_session
+from src.lib.db_con import async_engine, async_session, get_session, query_budget
 from src.api.core.operation.list_operation_helper import (
     applyFilters,
+    countRecords,
+)
+from src.api.core.operation.eager_helper import eager_options
+from src.api.core.operation.export_helper import (
+    EXPORT_FORMATS,
+    ExportEncoder,
+    csv_columns,
+    serialize_batch,
+)
+from src.api.core.operation.cursor_helper import (
+    PAGINATION_MODES,
+    applyKeyset,
+    applySort,
+    decode_cursor,
+    encode_cursor,
+    parse_sort,
+    sort_value,
+)
+from src.api.core.operation.projection_helper import (
+    SORT_VALUE,
+    check_query_paths,
+    parse_fields,
+    project_rows,
+    selectFields,
 )
 
 
@@ -34,26 +61,23 @@ def updateOp(
     return instance
 
 
-def listop(
-    session: Session,
+def listStatement(
     Model: type[SQLModel],
     filters: dict[str, any],
     searchFields: List[str],
     join_options: list = [],
-    page: int = None,
-    skip: int = 0,
-    limit: int = Query(10, ge=1, le=100),
+    fields: list[str] = None,
 ):
-
-    # Compute skip based on page
-    if page is not None:
-        skip = (page - 1) * limit
-
+    """Filtered SELECT shared by list and export (before sorting and pagination)."""
     # Start building base statement (without limit/offset for total count)
-    statement = select(Model)
+    if fields:
+        # Sparse fieldset: plain columns, no ORM objects
+        statement = selectFields(Model, fields)
+    else:
+        statement = select(Model)
 
     # Apply JOINs (like selectinload)
-    if join_options:
+    if join_options and not fields:
         for option in join_options:
             statement = statement.options(option)
 
@@ -62,6 +86,9 @@ def listop(
     dateRange = filters.get("dateRange")
     numberRange = filters.get("numberRange")
     customFilters = filters.get("customFilters")
+    # Route-supplied SQL conditions (never built from the query string)
+    for clause in filters.get("where") or ():
+        statement = statement.where(clause)
     # Apply Filters
     statement = applyFilters(
         statement,
@@ -73,53 +100,120 @@ def listop(
         numberRange=numberRange,
         customFilters=customFilters,
     )
+    return statement
 
-    # Total count (before pagination)
-    total = session.exec(statement).all()
-    total_count = len(total)
 
-    # Now apply pagination (skip/limit)
-    paginated_stmt = statement.offset(skip).limit(limit)
+def listop(
+    session: Session,
+    Model: type[SQLModel],
+    filters: dict[str, any],
+    searchFields: List[str],
+    join_options: list = [],
+    page: int = None,
+    skip: int = 0,
+    limit: int = Query(10, ge=1, le=100),
+    countMode: str = "exact",
+    countCap: int = LIST_COUNT_CAP,
+    sort: str = None,
+    pagination: str = "offset",
+    cursor: str = None,
+    fields: list[str] = None,
+):
+    # A cursor token always means keyset mode
+    if cursor:
+        pagination = "cursor"
+    if pagination not in PAGINATION_MODES:
+        api_response(400, "pagination must be 'offset' or 'cursor'")
 
-    results = session.exec(paginated_stmt).all()
+    # Compute skip based on page
+    if page is not None:
+        skip = (page - 1) * limit
 
-    return {"data": results, "total": total_count}
+    statement = listStatement(Model, filters, searchFields, join_options, fields)
 
+    # Total count (before pagination) — SELECT count(*) in SQL, rows never loaded
+    total_count = countRecords(session, statement, countMode, countCap)
 
-def listRecords(
+    # Stable ORDER BY (sort column, id); search relevance ordering only
+    # survives when the client did not ask for a sort or a cursor
+    if sort or pagination == "cursor":
+        statement = statement.order_by(None)
+    statement, sort_attr, descending = applySort(statement, Model, sort)
+    if fields and pagination == "cursor":
+        statement = statement.add_columns(sort_attr.label(SORT_VALUE))
+
+    if pagination == "offset":
+        # Now apply pagination (skip/limit)
+        paginated_stmt = statement.offset(skip).limit(limit)
+        results = session.exec(paginated_stmt).all()
+        return {"data": results, "total": total_count}
+
+    # Keyset pagination: seek past the last row of the previous page
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        statement = applyKeyset(
+            statement, Model, sort_attr, descending, value, last_id
+        )
+
+    # Fetch one extra row to know whether another page exists
+    results = session.exec(statement.limit(limit + 1)).all()
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        if fields:
+            value = last._mapping[SORT_VALUE]
+        else:
+            value = sort_value(last, parse_sort(sort)[0])
+        next_cursor = encode_cursor(sort, value, last.id)
+
+    return {"data": results, "total": total_count, "next_cursor": next_cursor}
+
+
+def listParams(query_params: dict, Schema: type[SQLModel] = None) -> dict:
+    """list_query_params (as a dict) -> keyword arguments for listop."""
+    check_query_paths(query_params, Schema)
+    return {
+        "filters": {
+            "searchTerm": query_params.get("searchTerm"),
+            "columnFilters": query_params.get("columnFilters"),
+            "dateRange": query_params.get("dateRange"),
+            "numberRange": query_params.get("numberRange"),
+        },
+        "page": int(query_params.get("page", 1)),
+        "skip": int(query_params.get("skip", 0)),
+        "limit": int(query_params.get("limit", 10)),
+        "countMode": query_params.get("countMode") or "exact",
+        "countCap": int(query_params.get("countCap") or LIST_COUNT_CAP),
+        "sort": query_params.get("sort"),
+        "pagination": query_params.get("pagination") or "offset",
+        "cursor": query_params.get("cursor"),
+        "fields": parse_fields(query_params.get("fields"), Schema),
+    }
+
+
+def _listRecordsPage(
+    session: Session,
     query_params: dict,
     searchFields: list[str],
     Model,
     join_options: list = [],
     Schema: type[SQLModel] = None,
 ):
-    session = next(get_session())  # get actual Session object
-    try:
-        # Extract params from query dict
-        dateRange = query_params.get("dateRange")
-        numberRange = query_params.get("numberRange")
-        searchTerm = query_params.get("searchTerm")
-        columnFilters = query_params.get("columnFilters")
-        page = int(query_params.get("page", 1))
-        skip = int(query_params.get("skip", 0))
-        limit = int(query_params.get("limit", 10))
-
-        filters = {
-            "searchTerm": searchTerm,
-            "columnFilters": columnFilters,
-            "dateRange": dateRange,
-            "numberRange": numberRange,
-        }
+    params = listParams(query_params, Schema)
+    fields = params["fields"]
 
+    # Preload every relationship the Schema renders (no lazy load per row)
+    if Schema and not fields:
+        join_options = [*join_options, *eager_options(Model, Schema)]
+
+    with query_budget(session, LIST_QUERY_BUDGET, f"{Model.__name__} list"):
         result = listop(
             session=session,
             Model=Model,
             searchFields=searchFields,
-            filters=filters,
-            skip=skip,
-            page=page,
-            limit=limit,
             join_options=join_options,
+            **params,
         )
 
         if not result["data"]:
@@ -127,12 +221,156 @@ def listRecords(
         # Convert each SQLModel Model instance into a ModelRead Pydantic model
         if not Schema:
             return result
-        list_data = [Schema.model_validate(prod) for prod in result["data"]]
-        return api_response(
-            200,
-            f"data found",
-            list_data,
-            result["total"],
+        if fields:
+            list_data = project_rows(result["data"], fields)
+        else:
+            list_data = [Schema.model_validate(prod) for prod in result["data"]]
+
+    return api_response(
+        200,
+        f"data found",
+        list_data,
+        result["total"],
+        next_cursor=result.get("next_cursor"),
+    )
+
+
+def listRecords(
+    query_params: dict,
+    searchFields: list[str],
+    Model,
+    join_options: list = [],
+    Schema: type[SQLModel] = None,
+):
+    session = next(get_session())  # get actual Session object
+    try:
+        return _listRecordsPage(
+            session, query_params, searchFields, Model, join_options, Schema
         )
     finally:
         session.close()
+
+
+async def listopAsync(session: AsyncSession, **kwargs):
+    """listop over an AsyncSession; same arguments and result as listop."""
+    return await session.run_sync(lambda sync_session: listop(sync_session, **kwargs))
+
+
+async def listRecordsAsync(
+    query_params: dict,
+    searchFields: list[str],
+    Model,
+    join_options: list = [],
+    Schema: type[SQLModel] = None,
+):
+    """
+    listRecords over the async engine. The shared pipeline runs through
+    AsyncSession.run_sync, so every query awaits the async driver instead of
+    blocking a worker thread (DB_MODE=sync: the whole page in the threadpool).
+    """
+    async with async_session() as session:
+        return await session.run_sync(
+            _listRecordsPage, query_params, searchFields, Model, join_options, Schema
+        )
+
+
+async def validateAsync(session: AsyncSession, Schema: type[SQLModel], instance):
+    """Schema.model_validate for async routes; relationships may lazy load here."""
+    return await session.run_sync(lambda _: Schema.model_validate(instance))
+
+
+def _exportPlan(query_params, searchFields, Model, Schema, format, join_options):
+    """Validated export statement + encoder, built before the response starts."""
+    if format not in EXPORT_FORMATS:
+        api_response(400, f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    check_query_paths(query_params, Schema)
+    fields = parse_fields(query_params.get("fields"), Schema)
+    filters = {
+        "searchTerm": query_params.get("searchTerm"),
+        "columnFilters": query_params.get("columnFilters"),
+        "dateRange": query_params.get("dateRange"),
+        "numberRange": query_params.get("numberRange"),
+    }
+    if not fields:
+        join_options = [*join_options, *eager_options(Model, Schema)]
+
+    statement = listStatement(Model, filters, searchFields, join_options, fields)
+    sort = query_params.get("sort")
+    if sort:
+        statement = statement.order_by(None)
+    statement, _, _ = applySort(statement, Model, sort)
+    statement = statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    columns = (fields or csv_columns(Schema)) if format == "csv" else None
+    return statement, fields, ExportEncoder(format, columns)
+
+
+def _exportResponse(chunks, Model, format):
+    filename = f"{Model.__tablename__}.{format}"
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def exportRecords(
+    query_params: dict,
+    searchFields: list[str],
+    Model,
+    Schema: type[SQLModel],
+    format: str = "ndjson",
+    join_options: list = [],
+):
+    """
+    Stream every row matching the list filters as NDJSON or CSV.
+    Rows come from a server-side cursor in EXPORT_BATCH_SIZE partitions, so
+    memory stays flat and a slow client simply slows the fetch down.
+    """
+    statement, fields, encoder = _exportPlan(
+        query_params, searchFields, Model, Schema, format, join_options
+    )
+
+    def chunks():
+        if header := encoder.header():
+            yield header
+        session = next(get_session())
+        try:
+            for rows in session.exec(statement).partitions():
+                yield encoder.encode(serialize_batch(rows, Schema, fields))
+        finally:
+            session.close()
+
+    return _exportResponse(chunks(), Model, format)
+
+
+async def exportRecordsAsync(
+    query_params: dict,
+    searchFields: list[str],
+    Model,
+    Schema: type[SQLModel],
+    format: str = "ndjson",
+    join_options: list = [],
+):
+    """exportRecords over the async engine (AsyncSession.stream)."""
+    if DB_MODE == "sync":
+        return exportRecords(
+            query_params, searchFields, Model, Schema, format, join_options
+        )
+
+    statement, fields, encoder = _exportPlan(
+        query_params, searchFields, Model, Schema, format, join_options
+    )
+
+    async def chunks():
+        if header := encoder.header():
+            yield header
+        async with AsyncSession(async_engine) as session:
+            result = await session.stream(statement)
+            if not fields:
+                result = result.scalars()
+            async for rows in result.partitions():
+                yield encoder.encode(serialize_batch(rows, Schema, fields))
+
+    return _exportResponse(chunks(), Model, format)
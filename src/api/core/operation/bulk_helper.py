@@ -0,0 +1,76 @@
+from typing import Any, AsyncIterator
+
+from fastapi import Request
+from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json
+
+from src.api.core.response import api_response
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def ndjson_request(request: Request) -> bool:
+    content_type = request.headers.get("content-type", "")
+    return any(media_type in content_type for media_type in NDJSON_TYPES)
+
+
+async def request_items(request: Request) -> AsyncIterator[tuple[int, Any]]:
+    """
+    (index, item) for each element of a JSON array body, or (index, raw line)
+    for an NDJSON body, read as it streams in so uploads are never held whole.
+    """
+    if ndjson_request(request):
+        index, buffer = 0, b""
+        async for data in request.stream():
+            *lines, buffer = (buffer + data).split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if buffer.strip():
+            yield index, buffer
+        return
+
+    try:
+        items = from_json(await request.body())
+    except ValueError:
+        items = None
+    if not isinstance(items, list):
+        api_response(400, "Body must be a JSON array or NDJSON")
+    for index, item in enumerate(items):
+        yield index, item
+
+
+async def chunked(items: AsyncIterator, size: int) -> AsyncIterator[list]:
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_items(
+    Schema: type[BaseModel], items: list[tuple[int, Any]]
+) -> tuple[list, list[dict]]:
+    """
+    [(index, item)] -> ([(index, Schema instance)], [failure]); a bad row is
+    reported with its index instead of failing the whole upload.
+    """
+    valid, failed = [], []
+    for index, item in items:
+        try:
+            if isinstance(item, bytes):
+                row = Schema.model_validate_json(item)
+            else:
+                row = Schema.model_validate(item)
+        except ValidationError as e:
+            errors = e.errors(
+                include_url=False, include_context=False, include_input=False
+            )
+            failed.append({"index": index, "reason": "invalid", "errors": errors})
+        else:
+            valid.append((index, row))
+    return valid, failed
@@ -0,0 +1,121 @@
+import base64
+import binascii
+from datetime import date, datetime
+import json
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, tuple_
+from sqlmodel import SQLModel
+from sqlmodel.sql.expression import SelectOfScalar
+
+from src.api.core.operation.list_operation_helper import resolve_column
+
+PAGINATION_MODES = ("offset", "cursor")
+
+
+def parse_sort(sort: Optional[str]):
+    """'-price' -> ('price', True), 'title' -> ('title', False), None -> ('id', False)"""
+    if not sort:
+        return "id", False
+    sort = sort.strip()
+    if sort.startswith("-"):
+        return sort[1:], True
+    return sort.lstrip("+"), False
+
+
+def applySort(
+    statement: SelectOfScalar,
+    Model: type[SQLModel],
+    sort: Optional[str] = None,
+):
+    """
+    ORDER BY (sort column, id) so every page is deterministic.
+    Returns (statement, sort column attr, descending).
+    """
+    column, descending = parse_sort(sort)
+    attr, statement = resolve_column(Model, column, statement)
+
+    id_attr = Model.id
+    if attr is id_attr:
+        order = [id_attr.desc() if descending else id_attr.asc()]
+    elif descending:
+        order = [attr.desc().nulls_last(), id_attr.desc()]
+    else:
+        order = [attr.asc().nulls_last(), id_attr.asc()]
+
+    return statement.order_by(*order), attr, descending
+
+
+def applyKeyset(
+    statement: SelectOfScalar,
+    Model: type[SQLModel],
+    attr,
+    descending: bool,
+    value: Any,
+    last_id: int,
+):
+    """
+    Seek past (value, last_id) instead of OFFSET:
+      WHERE (col, id) > (:value, :last_id)   (or < when descending)
+    NULL sort values are ordered last, matching applySort.
+    """
+    id_attr = Model.id
+    if attr is id_attr:
+        return statement.where(id_attr < last_id if descending else id_attr > last_id)
+
+    after_id = id_attr < last_id if descending else id_attr > last_id
+    if value is None:
+        # already inside the trailing NULL block
+        return statement.where(and_(attr.is_(None), after_id))
+
+    row = tuple_(attr, id_attr)
+    seek = row < tuple_(value, last_id) if descending else row > tuple_(value, last_id)
+    if _is_nullable(attr):
+        seek = or_(seek, attr.is_(None))
+    return statement.where(seek)
+
+
+def _is_nullable(attr):
+    try:
+        return attr.property.columns[0].nullable
+    except Exception:
+        return True
+
+
+def sort_value(row, column: str):
+    """Read 'category.title' style paths off a result row."""
+    value = row
+    for part in column.split("."):
+        if value is None:
+            return None
+        value = getattr(value, part)
+    return value
+
+
+def encode_cursor(sort: Optional[str], value: Any, last_id: int) -> str:
+    payload = {"s": sort or "", "v": value, "id": last_id}
+    if isinstance(value, datetime):
+        payload.update(v=value.isoformat(), t="datetime")
+    elif isinstance(value, date):
+        payload.update(v=value.isoformat(), t="date")
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort: Optional[str]):
+    """Opaque token -> (value, last_id); the token must belong to the same sort."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        value, last_id = payload["v"], int(payload["id"])
+        if payload.get("t") == "datetime":
+            value = datetime.fromisoformat(value)
+        elif payload.get("t") == "date":
+            value = date.fromisoformat(value)
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+
+    if payload.get("s", "") != (sort or ""):
+        raise HTTPException(400, "Cursor does not match the requested sort")
+    return value, last_id
@@ -0,0 +1,63 @@
+from functools import lru_cache
+from types import UnionType
+from typing import Union, get_args, get_origin
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import SQLModel
+
+# how many relationship hops below the listed model are preloaded
+EAGER_LOAD_DEPTH = 2
+
+
+def nested_schema(annotation):
+    """
+    Optional[X] / list[X] / X | None -> (X, is_collection) when X is a pydantic
+    model, else (None, False).
+    """
+    if get_origin(annotation) in (Union, UnionType):
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    is_collection = get_origin(annotation) in (list, tuple, set)
+    if is_collection:
+        args = get_args(annotation)
+        annotation = args[0] if args else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, is_collection
+    return None, False
+
+
+def _plan(Model, Schema, depth, parent=None):
+    """Walk Schema fields that are relationships on Model and chain loader options."""
+    options = []
+    if depth <= 0:
+        return options
+    relationships = inspect(Model).relationships
+    for name, field in Schema.model_fields.items():
+        relationship = relationships.get(name)
+        nested, _ = nested_schema(field.annotation)
+        if relationship is None or nested is None:
+            continue
+
+        attr = getattr(Model, name)
+        # collections -> one extra IN query; many-to-one -> LEFT JOIN in the page query
+        if relationship.uselist:
+            loader = parent.selectinload(attr) if parent else selectinload(attr)
+        else:
+            loader = parent.joinedload(attr) if parent else joinedload(attr)
+
+        children = _plan(relationship.mapper.class_, nested, depth - 1, loader)
+        options.extend(children or [loader])
+    return options
+
+
+@lru_cache(maxsize=None)
+def eager_options(
+    Model: type[SQLModel], Schema: type[BaseModel], depth: int = EAGER_LOAD_DEPTH
+) -> tuple:
+    """
+    Loader options so Schema.model_validate(row) never triggers a lazy load.
+    ProductRead -> (joinedload(Product.user), joinedload(Product.category))
+    """
+    return tuple(_plan(Model, Schema, depth))
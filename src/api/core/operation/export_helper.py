@@ -0,0 +1,80 @@
+import csv
+from datetime import date, datetime
+import io
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from src.api.core.operation.eager_helper import nested_schema
+from src.api.core.operation.projection_helper import project_rows
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def csv_columns(Schema: type[BaseModel], prefix: str = "", depth: int = 2) -> list[str]:
+    """ProductRead -> ["id", ..., "category.id", "category.title", ...]"""
+    columns = []
+    for name, field in Schema.model_fields.items():
+        nested, is_collection = nested_schema(field.annotation)
+        if nested is not None and not is_collection and depth > 0:
+            columns.extend(csv_columns(nested, f"{prefix}{name}.", depth - 1))
+        else:
+            columns.append(f"{prefix}{name}")
+    return columns
+
+
+def _csv_value(item: dict, path: str):
+    value = item
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    if isinstance(value, (dict, list)):
+        return to_json(value).decode()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def serialize_batch(
+    rows: list,
+    Schema: Optional[type[BaseModel]],
+    fields: Optional[list[str]],
+) -> list:
+    """One yield_per partition -> Schema instances, or dicts for a sparse fieldset."""
+    if fields:
+        return project_rows(rows, fields)
+    return [Schema.model_validate(row) for row in rows]
+
+
+class ExportEncoder:
+    """Turns serialized batches into response chunks (one chunk per batch)."""
+
+    def __init__(self, format: str, columns: Optional[list[str]] = None):
+        self.format = format
+        self.columns = columns
+
+    def header(self) -> bytes:
+        if self.format != "csv":
+            return b""
+        return self._csv_rows([self.columns])
+
+    def encode(self, items: list) -> bytes:
+        if self.format != "csv":
+            return b"".join(to_json(item) + b"\n" for item in items)
+        rows = []
+        for item in items:
+            if isinstance(item, BaseModel):
+                item = item.model_dump(mode="json")
+            rows.append([_csv_value(item, column) for column in self.columns])
+        return self._csv_rows(rows)
+
+    @staticmethod
+    def _csv_rows(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
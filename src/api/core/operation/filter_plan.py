@@ -0,0 +1,334 @@
+import ast
+from dataclasses import dataclass
+from functools import lru_cache
+import json
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import sqltypes as SATypes
+from sqlmodel import SQLModel
+
+from src.api.core.utility import parse_date
+
+# statement.execution_options key holding the relationship paths already joined
+JOINED_PATHS = "list_joined_paths"
+
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(value: str) -> str:
+    """Make user input literal inside a LIKE pattern."""
+    return (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def _get_column_type(attr):
+    # attr is InstrumentedAttribute of a column
+    try:
+        return attr.property.columns[0].type
+    except Exception:
+        return None  # relationship or something unexpected
+
+
+def _is_integer_type(t):
+    return isinstance(t, (SATypes.Integer, SATypes.BigInteger, SATypes.SmallInteger))
+
+
+def _is_numeric_type(t):
+    return isinstance(
+        t, (SATypes.Numeric, SATypes.Float, SATypes.DECIMAL)
+    ) or _is_integer_type(t)
+
+
+def _is_bool_type(t):
+    return isinstance(t, SATypes.Boolean)
+
+
+def _is_datetime_type(t):
+    return isinstance(t, SATypes.DateTime)
+
+
+def _coercer_for(col_type, col_name: str) -> Callable[[Any], Any]:
+    """Pick, once per column, the function that turns request values into column values."""
+    if col_type is None:
+        # Fallback – treat as string
+        return lambda value: value
+
+    if _is_numeric_type(col_type):
+        to_number = int if _is_integer_type(col_type) else float
+
+        def coerce_number(value):
+            if isinstance(value, (int, float)):
+                return value
+            if isinstance(value, str):
+                try:
+                    return to_number(value.strip())
+                except ValueError:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Column '{col_name}' expects a number; got '{value}'.",
+                    )
+            raise HTTPException(400, f"Column '{col_name}' expects a number.")
+
+        return coerce_number
+
+    if _is_bool_type(col_type):
+
+        def coerce_bool(value):
+            if isinstance(value, bool):
+                return value
+            if isinstance(value, str):
+                v = value.strip().lower()
+                if v in ("true", "1", "yes"):
+                    return True
+                if v in ("false", "0", "no"):
+                    return False
+            raise HTTPException(400, f"Column '{col_name}' expects a boolean.")
+
+        return coerce_bool
+
+    if _is_datetime_type(col_type):
+
+        def coerce_datetime(value):
+            if isinstance(value, str):
+                return parse_date(value)
+            raise HTTPException(400, f"Column '{col_name}' expects a datetime string.")
+
+        return coerce_datetime
+
+    # string-like or other -> ensure string
+    return lambda value: value if isinstance(value, str) else str(value)
+
+
+def _coerce_value_for_column(col_type, value, col_name: str):
+    """Coerce incoming value (possibly a string) to a Python value compatible with the column type."""
+    return _coercer_for(col_type, col_name)(value)
+
+
+@dataclass(frozen=True)
+class ColumnPlan:
+    """Everything needed to filter on one column path, resolved once per (Model, path)."""
+
+    path: str
+    attr: Any  # column attribute (on an alias when reached through a relationship)
+    joins: tuple  # ((path prefix, relationship attr), ...) in join order
+    col_type: Any
+    coerce: Callable[[Any], Any]
+    operators: frozenset
+    default_op: str
+
+    def predicate(self, value, op: Optional[str] = None):
+        op = op or self.default_op
+        if op not in self.operators:
+            raise HTTPException(
+                400, f"Operator '{op}' is not supported for column '{self.path}'"
+            )
+        value = self.coerce(value)
+        if op == "contains" and isinstance(value, str):
+            # raw column ILIKE '%v%' -> served by the pg_trgm GIN index
+            return self.attr.ilike(f"%{escape_like(value)}%", escape=LIKE_ESCAPE)
+        if op == "prefix":
+            # case-sensitive LIKE 'v%' -> served by the text_pattern_ops index
+            return self.attr.like(f"{escape_like(str(value))}%", escape=LIKE_ESCAPE)
+        return self.attr == value
+
+
+class FilterPlan:
+    """Per-model registry: column path -> ColumnPlan."""
+
+    def __init__(self, Model: type[SQLModel]):
+        self.Model = Model
+        self._columns: dict[str, ColumnPlan] = {}
+        # relationship path prefix -> aliased target, shared by all columns below it
+        self._aliases: dict[str, Any] = {}
+        self._lock = Lock()
+
+    def column(self, path: str) -> ColumnPlan:
+        plan = self._columns.get(path)
+        if plan is None:
+            with self._lock:
+                plan = self._columns.get(path)
+                if plan is None:
+                    plan = self._columns[path] = self._build(path)
+        return plan
+
+    def _build(self, path: str) -> ColumnPlan:
+        current = self.Model
+        joins = []
+        attr = None
+        parts = path.split(".")
+        for i, part in enumerate(parts):
+            mapper_attr = getattr(current, part, None)
+            if mapper_attr is None:
+                raise HTTPException(400, f"Unknown column '{path}'")
+
+            if hasattr(mapper_attr, "property") and hasattr(
+                mapper_attr.property, "mapper"
+            ):
+                # It's a relationship -> outer join an alias of the related model
+                prefix = ".".join(parts[: i + 1])
+                target = self._aliases.get(prefix)
+                if target is None:
+                    target = aliased(mapper_attr.property.mapper.class_)
+                    self._aliases[prefix] = target
+                joins.append((prefix, mapper_attr.of_type(target)))
+                current = target
+            else:
+                # It's a column
+                attr = mapper_attr
+
+        if attr is None:
+            raise HTTPException(400, f"'{path}' is a relationship, not a column")
+
+        col_type = _get_column_type(attr)
+        if (
+            _is_numeric_type(col_type)
+            or _is_bool_type(col_type)
+            or _is_datetime_type(col_type)
+        ):
+            operators, default_op = frozenset({"eq"}), "eq"
+        else:
+            # string-like (AutoString is a TypeDecorator, not a String subclass)
+            operators, default_op = frozenset({"contains", "prefix", "eq"}), "contains"
+
+        return ColumnPlan(
+            path=path,
+            attr=attr,
+            joins=tuple(joins),
+            col_type=col_type,
+            coerce=_coercer_for(col_type, path),
+            operators=operators,
+            default_op=default_op,
+        )
+
+
+@lru_cache(maxsize=None)
+def filter_plan(Model: type[SQLModel]) -> FilterPlan:
+    return FilterPlan(Model)
+
+
+def apply_joins(statement, joins: tuple):
+    """Outer join each relationship once per statement, however many filters use it."""
+    joined = statement.get_execution_options().get(JOINED_PATHS, ())
+    added = False
+    for prefix, relationship in joins:
+        if prefix in joined:
+            continue
+        statement = statement.join(relationship, isouter=True)
+        joined += (prefix,)
+        added = True
+    if added:
+        statement = statement.execution_options(**{JOINED_PATHS: joined})
+    return statement
+
+
+class CompiledFilter:
+    """A ready WHERE clause plus the joins it needs."""
+
+    def __init__(self, joins: tuple, clause):
+        self.joins = joins
+        self.clause = clause
+
+    def apply(self, statement):
+        statement = apply_joins(statement, self.joins)
+        if self.clause is not None:
+            statement = statement.where(self.clause)
+        return statement
+
+
+def _compile_pairs(Model, pairs) -> CompiledFilter:
+    """[(col, value)] or [(col, op, value)] -> one AND-ed CompiledFilter"""
+    plan = filter_plan(Model)
+    joins, clauses = [], []
+    for pair in pairs:
+        col, op, value = pair if len(pair) == 3 else (pair[0], None, pair[1])
+        column = plan.column(col)
+        joins.extend(column.joins)
+        clauses.append(column.predicate(value, op))
+    return CompiledFilter(tuple(joins), and_(*clauses) if clauses else None)
+
+
+def parse_column_filters(columnFilters: str) -> list[tuple]:
+    """"[['title','car'],['email','prefix','ann']]" -> [(col, value) | (col, op, value)]"""
+    try:
+        parsed_terms = ast.literal_eval(  # parsing work for all string, array, object, tupple
+            columnFilters
+        )  # in js write=JSON.parse(columnFilters);
+        pairs = [
+            tuple(sublist) for sublist in parsed_terms
+        ]  # in js write=parsed_terms.map(sublist => tuple(sublist));
+        if any(len(pair) not in (2, 3) for pair in pairs):
+            raise ValueError(columnFilters)
+    except Exception:
+        raise HTTPException(
+            status_code=400,
+            detail="columnFilters must be JSON list like [['field', 'value']]",
+        )
+    return pairs
+
+
+@lru_cache(maxsize=1024)
+def compile_column_filters(Model: type[SQLModel], columnFilters: str) -> CompiledFilter:
+    """
+    "[['title','car'],['email','prefix','ann']]" -> CompiledFilter, cached per filter string.
+    Operators: contains (default for text), prefix, eq (default otherwise).
+    """
+    return _compile_pairs(Model, parse_column_filters(columnFilters))
+
+
+def compile_custom_filters(Model: type[SQLModel], customFilters) -> CompiledFilter:
+    return _compile_pairs(Model, customFilters)
+
+
+@lru_cache(maxsize=256)
+def _search_columns(Model: type[SQLModel], searchFields: tuple):
+    plan = filter_plan(Model)
+    columns = [plan.column(col) for col in searchFields]
+    joins = tuple(join for column in columns for join in column.joins)
+    return joins, tuple(column.attr for column in columns)
+
+
+def compile_search(
+    Model: type[SQLModel], searchFields: tuple, searchTerm: str
+) -> CompiledFilter:
+    joins, attrs = _search_columns(Model, searchFields)
+    pattern = f"%{escape_like(searchTerm)}%"
+    return CompiledFilter(
+        joins, or_(*[attr.ilike(pattern, escape=LIKE_ESCAPE) for attr in attrs])
+    )
+
+
+@lru_cache(maxsize=256)
+def compile_number_range(Model: type[SQLModel], numberRange: str) -> CompiledFilter:
+    # number_range should be like ("amount", "0", "100000")
+    try:
+        parsed = tuple(json.loads(numberRange))
+        column_name, *values = parsed  # first element is column name, rest are values
+
+        # Assign safely
+        min_val = float(values[0]) if len(values) >= 1 and values[0] else None
+        max_val = float(values[1]) if len(values) >= 2 else None
+    except (ValueError, TypeError):
+        raise HTTPException(
+            400, "numberRange must be JSON list like ['amount', 0, 100000]"
+        )
+
+    column = filter_plan(Model).column(column_name)
+    if not _is_numeric_type(column.col_type):
+        raise HTTPException(400, f"Column '{column_name}' is not numeric")
+
+    attr = column.attr
+    clause = None
+    if min_val is not None and max_val is not None:
+        clause = attr.between(min_val, max_val)
+    elif min_val is not None:
+        clause = attr >= min_val
+    elif max_val is not None:
+        clause = attr <= max_val
+    return CompiledFilter(column.joins, clause)
@@ -0,0 +1,117 @@
+import json
+from typing import Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlmodel import SQLModel, select
+
+from src.api.core.operation.eager_helper import nested_schema
+from src.api.core.operation.cursor_helper import parse_sort
+from src.api.core.operation.filter_plan import (
+    apply_joins,
+    filter_plan,
+    parse_column_filters,
+)
+
+# label of the extra column carrying the sort value in projected cursor pages
+SORT_VALUE = "_sort_value"
+
+
+def parse_fields(
+    fields: Optional[str], Schema: Optional[type[BaseModel]]
+) -> Optional[list[str]]:
+    """
+    "title,price,category.title" -> ["id", "title", "price", "category.title"]
+    Only paths the response Schema exposes are allowed (never e.g. password).
+    """
+    if not fields or Schema is None:
+        return None
+
+    paths = ["id"]
+    for path in fields.split(","):
+        path = path.strip()
+        if not path or path in paths:
+            continue
+        check_path(path, Schema)
+        paths.append(path)
+    return paths
+
+
+def check_path(path: str, Schema: type[BaseModel], kind: str = "field"):
+    """400 unless `path` is a plain value the response Schema exposes."""
+    current = Schema
+    parts = path.split(".")
+    for i, part in enumerate(parts):
+        field = current.model_fields.get(part) if current else None
+        if field is None:
+            raise HTTPException(400, f"Unknown {kind} '{path}'")
+        nested, is_collection = nested_schema(field.annotation)
+        if is_collection:
+            raise HTTPException(400, f"{kind.capitalize()} '{path}' is a list")
+        if i < len(parts) - 1:
+            current = nested
+        elif nested is not None:
+            raise HTTPException(
+                400, f"{kind.capitalize()} '{path}' is an object, pick its columns"
+            )
+
+
+def _range_column(value: Optional[str]) -> Optional[str]:
+    """'["price", 0, 10]' -> "price"; malformed ranges are left to the filters."""
+    try:
+        return json.loads(value)[0] if value else None
+    except (ValueError, TypeError, IndexError, KeyError):
+        return None
+
+
+def check_query_paths(query_params: dict, Schema: Optional[type[BaseModel]]):
+    """
+    sort and the columnFilters / numberRange / dateRange columns may only use
+    paths the response Schema exposes, like parse_fields: sorting or
+    filtering on user.password would leak it through cursors and counts.
+    """
+    if Schema is None:
+        return
+    sort = query_params.get("sort")
+    if sort:
+        check_path(parse_sort(sort)[0], Schema, "sort field")
+    columnFilters = query_params.get("columnFilters")
+    for pair in parse_column_filters(columnFilters) if columnFilters else ():
+        check_path(str(pair[0]), Schema, "filter field")
+    for name in ("numberRange", "dateRange"):
+        column = _range_column(query_params.get(name))
+        if column is not None:
+            check_path(str(column), Schema, "filter field")
+
+
+def selectFields(Model: type[SQLModel], fields: list[str]):
+    """Column-only SELECT labelled by path, with the joins nested paths need."""
+    plan = filter_plan(Model)
+    columns = []
+    for path in fields:
+        try:
+            column = plan.column(path)
+        except HTTPException:
+            raise HTTPException(400, f"Field '{path}' cannot be selected")
+        columns.append(column)
+
+    statement = select(*[column.attr.label(column.path) for column in columns])
+    for column in columns:
+        statement = apply_joins(statement, column.joins)
+    return statement
+
+
+def project_rows(rows, fields: list[str]) -> list[dict]:
+    """Rows labelled 'category.title' -> {"category": {"title": ...}}"""
+    data = []
+    for row in rows:
+        mapping = row._mapping
+        item = {}
+        for path in fields:
+            *parents, leaf = path.split(".")
+            target = item
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[leaf] = mapping[path]
+        data.append(item)
+    return data
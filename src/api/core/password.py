@@ -0,0 +1,134 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+import time
+from typing import Callable, Optional
+
+from passlib.context import CryptContext
+
+from src.config import (
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
+    ARGON2_TIME_COST,
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_QUEUE,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_SCHEME,
+)
+from src.api.core.response import api_response
+
+# New hashes use PASSWORD_SCHEME; the other schemes only verify (deprecated)
+pwd_context = CryptContext(
+    schemes=[PASSWORD_SCHEME]
+    + [s for s in ("bcrypt", "argon2") if s != PASSWORD_SCHEME],
+    deprecated="auto",
+    # min = default: hashes made with fewer rounds need an update
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
+
+
+class HashPool:
+    """
+    Bounded thread pool for password hashing, so a login burst waits here
+    instead of holding request threads. At most `workers` hashes run at
+    once and `queue` more wait; past that callers get a 503.
+    """
+
+    def __init__(self, workers: int, queue: int):
+        self.workers = workers
+        self.queue = queue
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="password")
+        self._lock = Lock()
+        self.pending = 0
+        self.completed = self.rejected = 0
+        self.queue_seconds = self.queue_seconds_max = self.hash_seconds = 0.0
+
+    async def run(self, fn: Callable, *args):
+        with self._lock:
+            if self.pending >= self.workers + self.queue:
+                self.rejected += 1
+                busy = True
+            else:
+                self.pending += 1
+                busy = False
+        if busy:
+            api_response(503, "Too many sign-in requests, try again shortly")
+
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self._record(started - submitted, time.perf_counter() - started)
+
+        try:
+            future = self._executor.submit(job)
+        except BaseException:
+            self._done()
+            raise
+        # a slot frees when the hash finishes (or is cancelled before it
+        # started), not when the awaiting request goes away mid-hash
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def _done(self, future=None):
+        with self._lock:
+            self.pending -= 1
+
+    def _record(self, queued: float, took: float):
+        with self._lock:
+            self.completed += 1
+            self.queue_seconds += queued
+            self.queue_seconds_max = max(self.queue_seconds_max, queued)
+            self.hash_seconds += took
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed or None  # averages stay None until a hash ran
+            return {
+                "scheme": PASSWORD_SCHEME,
+                "workers": self.workers,
+                "queue": self.queue,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_queue_ms": done and round(self.queue_seconds / done * 1000, 2),
+                "max_queue_ms": round(self.queue_seconds_max * 1000, 2),
+                "avg_hash_ms": done and round(self.hash_seconds / done * 1000, 2),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hash_pool = HashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run(pwd_context.hash, password)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """
+    (matches, new_hash): new_hash is set when the stored hash uses another
+    scheme or older cost parameters; save it in place of the old one.
+    """
+    return await hash_pool.run(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from threading import RLock
+import time
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from src.config import ROLE_REGISTRY_TTL
+from src.lib.db_con import engine
+from src.api.models.roleModel import Role
+
+
+@dataclass(frozen=True, slots=True)
+class RoleEntry:
+    id: int
+    title: str
+    permissions: frozenset[str]
+    version: int
+
+    def allows(self, permission: str) -> bool:
+        return "all" in self.permissions or permission in self.permissions
+
+
+class PermissionRegistry:
+    """
+    role_id -> RoleEntry for every role, held in memory. Access tokens carry
+    only role_id and the role version they were issued at, so permissions
+    are looked up here per request (O(1)) instead of being copied into the
+    token. A token newer than the entry means another worker changed the
+    role: reload. Otherwise reloaded after `ttl` seconds, like the category
+    tree, so changes made elsewhere reach tokens issued before them.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.roles: dict[int, RoleEntry] = {}
+        self.misses: dict[int, int] = {}  # role_id -> token version looked up
+        self.loaded_at: Optional[float] = None
+        self._lock = RLock()
+
+    def resolve(self, role_id: int, version: int = 0) -> Optional[RoleEntry]:
+        entry = self.roles.get(role_id)
+        if self._expired():
+            stale = True
+        elif entry is None:
+            # unknown (e.g. deleted) role: the miss is cached like an entry,
+            # only a token newer than the version already looked up reloads
+            stale = version > self.misses.get(role_id, -1)
+        else:
+            stale = entry.version < version
+        if stale:
+            self.reload()
+            entry = self.roles.get(role_id)
+            if entry is None:
+                with self._lock:
+                    self.misses = {**self.misses, role_id: version}
+        return entry
+
+    def _expired(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    def reload(self):
+        with Session(engine) as session:
+            self.rebuild(session.exec(select(Role)).all())
+
+    def rebuild(self, rows):
+        roles = {row.id: self._entry(row) for row in rows}
+        with self._lock:
+            self.roles = roles
+            self.misses = {}
+            self.loaded_at = time.monotonic()
+
+    # -- writes (call after commit) ------------------------------------------
+
+    def upsert(self, row: Role):
+        with self._lock:
+            current = self.roles.get(row.id)
+            if current is None or current.version <= row.version:
+                self.roles = {**self.roles, row.id: self._entry(row)}
+
+    def remove(self, role_id: int):
+        with self._lock:
+            self.roles = {id: e for id, e in self.roles.items() if id != role_id}
+
+    @staticmethod
+    def _entry(row: Role) -> RoleEntry:
+        return RoleEntry(
+            row.id, row.title, frozenset(row.permissions or ()), row.version or 1
+        )
+
+
+# Process-wide registry used by require_signin / require_permission
+permission_registry = PermissionRegistry(ROLE_REGISTRY_TTL)
@@ -7,6 +7,25 @@ from fastapi.encoders import (
 from fastapi.responses import (
     JSONResponse,
 )
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Serializes with pydantic-core (Rust) straight to bytes. Output matches
+    JSONResponse: compact separators, UTF-8, same key order.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, by_alias=True)
+
+
+def _is_model_payload(data) -> bool:
+    """A validated Schema instance or a list of them (the list/read endpoints)."""
+    if isinstance(data, BaseModel):
+        return True
+    return isinstance(data, list) and all(isinstance(item, BaseModel) for item in data)
 
 
 def api_response(
@@ -14,17 +33,24 @@ def api_response(
     detail: str,
     data: Optional[Union[dict, list]] = None,
     total: Optional[int] = None,
+    next_cursor: Optional[str] = None,
 ):
 
+    # Models are dumped once by pydantic-core in the response; anything else
+    # (plain dicts, projected rows) keeps the jsonable_encoder conversion
+    fast = data is not None and _is_model_payload(data)
     content = {
         "success": (1 if code < 300 else 0),
         "detail": detail,
-        "data": jsonable_encoder(data),
+        "data": data if fast else jsonable_encoder(data),
     }
 
     if total is not None:
         content["total"] = total
 
+    if next_cursor is not None:
+        content["next_cursor"] = next_cursor
+
     # Raise error if code >= 400
     if code >= 400:
         raise HTTPException(
@@ -32,7 +58,8 @@ def api_response(
             detail=detail,
         )
 
-    return JSONResponse(
+    response_class = FastJSONResponse if fast else JSONResponse
+    return response_class(
         status_code=code,
         content=content,
     )
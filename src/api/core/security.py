@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta, timezone
+import hashlib
+import time
 from typing import Dict, Optional
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlmodel import Session
@@ -14,16 +15,24 @@ from fastapi.security import (
     HTTPBearer,
 )
 
-from src.config import ACCESS_TOKEN_EXPIRE_MINUTES, SECRET_KEY
+from src.config import ACCESS_TOKEN_EXPIRE_MINUTES, SECRET_KEY, TOKEN_CACHE_SIZE
+from src.api.core.cache import TTLCache
+from src.api.core.permission_registry import permission_registry
+from src.api.core.password import (  # noqa: F401  (re-exported)
+    hash_password,
+    hash_password_async,
+    pwd_context,
+    verify_password,
+    verify_password_async,
+)
 from src.api.core.response import api_response
 from src.api.models.userModel import User, UserRead
 
 ALGORITHM = "HS256"
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-)
+# sha256(token) -> verified token claims, kept until the token expires; the
+# TTL below only caps it
+token_cache = TTLCache(TOKEN_CACHE_SIZE, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 
 ## get user
@@ -32,14 +41,6 @@ def exist_user(db: Session, email: str):
     return user
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 def create_access_token(
     user_data: dict,
     refresh: Optional[bool] = False,
@@ -92,10 +93,20 @@ def decode_token(
         return None
 
 
-def require_signin(
-    credentials: HTTPAuthorizationCredentials = Security(HTTPBearer()),
-) -> Dict:
-    token = credentials.credentials  # Extract token from Authorization header
+def role_claims(role) -> dict:
+    """Token claims naming the user's role: permissions come from the registry."""
+    return {"role_id": role.id if role else None, "rv": role.version if role else 0}
+
+
+def token_claims(token: str) -> Dict:
+    """
+    Verified user claims of an access token. The first request of a session
+    pays for jwt.decode; later ones are a digest + dict lookup.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    user = token_cache.get(key)
+    if user is not None:
+        return user
 
     try:
         payload = jwt.decode(
@@ -103,28 +114,53 @@ def require_signin(
             SECRET_KEY,
             algorithms=[ALGORITHM],
         )
-        user = payload.get("user")
-
-        if user is None:
-            api_response(
-                status.HTTP_401_UNAUTHORIZED,
-                "Invalid token: no user data",
-            )
-
-        if payload.get("refresh") is True:
-            api_response(
-                401,
-                "Refresh token is not allowed for this route",
-            )
-
-        return user  # contains {"email": ..., "id": ...}
-
     except JWTError:
         api_response(
             status.HTTP_401_UNAUTHORIZED,
             "Invalid or expired token",
         )
 
+    user = payload.get("user")
+    if user is None:
+        api_response(
+            status.HTTP_401_UNAUTHORIZED,
+            "Invalid token: no user data",
+        )
+
+    if payload.get("refresh") is True:
+        api_response(
+            401,
+            "Refresh token is not allowed for this route",
+        )
+
+    if "permissions" in user:  # issued before the registry, list in the token
+        user = {**user, "permissions": frozenset(user["permissions"] or ())}
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        token_cache.set(key, user, ttl=min(remaining, token_cache.ttl))
+    return user
+
+
+def signin_user(token: str) -> Dict:
+    """Token claims plus the role title and permission set from the registry."""
+    claims = token_claims(token)
+    if "role_id" not in claims:
+        return claims
+    role_id = claims["role_id"]
+    role = permission_registry.resolve(role_id, claims.get("rv", 0)) if role_id else None
+    return {
+        **claims,
+        "role": role.title if role else None,
+        "permissions": role.permissions if role else frozenset(),
+    }
+
+
+def require_signin(
+    credentials: HTTPAuthorizationCredentials = Security(HTTPBearer()),
+) -> Dict:
+    # Extract token from Authorization header
+    return signin_user(credentials.credentials)  # {"email": ..., "id": ...}
+
 
 def require_admin(
     user: dict = Depends(require_signin),
@@ -150,7 +186,7 @@ def require_permission(permission: str):
         user: dict = Depends(require_signin),
     ):
         role = user.get("role")
-        permissions = user.get("permissions", [])
+        permissions = user.get("permissions", frozenset())
         if not role:
             api_response(403, "Permission denied")
 
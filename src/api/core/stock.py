@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    any_,
+    bindparam,
+    func,
+    literal,
+    select,
+    update as sql_update,
+    values as sql_values,
+)
+from sqlalchemy.sql import column
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import RESERVATION_TTL_MINUTES
+from src.api.core.response import api_response
+from src.api.models.productModel import Product
+from src.api.models.reservationModel import Reservation, ReservationItem
+
+
+def _locked(where):
+    """
+    Ids of the products matching `where`, locked FOR UPDATE in id order:
+    baskets sharing products queue up on the first common row instead of
+    deadlocking.
+    """
+    product = Product.__table__
+    return (
+        select(product.c.id)
+        .where(where)
+        .order_by(product.c.id)
+        .with_for_update(of=product)
+        .subquery("locked")
+    )
+
+
+def reserve_statement(basket: dict[int, int]):
+    """
+    UPDATE product SET stock = stock - b.qty FROM (VALUES ...) AS b
+    WHERE stock >= b.qty ... RETURNING id: each row is checked and
+    decremented atomically, a product short on stock is simply not returned.
+    Stock changes bump updated_at like any other edit (list/read ETags).
+    """
+    product = Product.__table__
+    ids = sorted(basket)
+    rows = sql_values(
+        column("id", Integer), column("qty", Integer), name="basket"
+    ).data([(id, basket[id]) for id in ids])
+    locked = _locked(product.c.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))))
+    return (
+        sql_update(product)
+        .where(
+            product.c.id == rows.c.id,
+            product.c.id == locked.c.id,
+            product.c.stock >= rows.c.qty,
+            product.c.is_active,
+        )
+        .values(stock=product.c.stock - rows.c.qty, updated_at=func.now())
+        .returning(product.c.id)
+    )
+
+
+def release_statement(status: str, *where):
+    """
+    Held reservations matching `where` -> `status`, with their quantities
+    put back on stock, in one statement. Rows: (id, "reservation" | "product").
+    A reservation already moved on by a concurrent call is skipped, so
+    stock is never returned twice.
+    """
+    reservation, item = Reservation.__table__, ReservationItem.__table__
+    product = Product.__table__
+    released = (
+        sql_update(reservation)
+        .where(reservation.c.status == "held", *where)
+        .values(status=status, updated_at=func.now())
+        .returning(reservation.c.id)
+        .cte("released")
+    )
+    totals = (
+        select(item.c.product_id, func.sum(item.c.qty).label("qty"))
+        .where(item.c.reservation_id.in_(select(released.c.id)))
+        .group_by(item.c.product_id)
+        .subquery("totals")
+    )
+    locked = _locked(product.c.id.in_(select(totals.c.product_id)))
+    restocked = (
+        sql_update(product)
+        .where(product.c.id == totals.c.product_id, product.c.id == locked.c.id)
+        .values(stock=product.c.stock + totals.c.qty, updated_at=func.now())
+        .returning(product.c.id)
+        .cte("restocked")
+    )
+    return select(released.c.id, literal("reservation").label("kind")).union_all(
+        select(restocked.c.id, literal("product"))
+    )
+
+
+def expired_statement(product_ids: Optional[list[int]] = None):
+    """
+    Release every expired hold, or (product_ids) only those holding one of
+    these products: a basket sweeps what it may need, not the whole table
+    (release_reservations does that from cron).
+    """
+    reservation, item = Reservation.__table__, ReservationItem.__table__
+    now = datetime.now(timezone.utc)
+    where = [reservation.c.expires_at <= now]
+    if product_ids is not None:
+        ids = bindparam("product_ids", sorted(product_ids), type_=ARRAY(Integer))
+        where.append(
+            reservation.c.id.in_(
+                select(item.c.reservation_id).where(item.c.product_id == any_(ids))
+            )
+        )
+    return release_statement("expired", *where)
+
+
+async def release(session: AsyncSession, statement) -> tuple[list[int], list[int]]:
+    """Run a release_statement -> (reservation ids, restocked product ids)."""
+    rows = (await session.exec(statement)).all()
+    reservations = [row.id for row in rows if row.kind == "reservation"]
+    return reservations, [row.id for row in rows if row.kind == "product"]
+
+
+async def reserve(
+    session: AsyncSession,
+    user_id: int,
+    items: list,
+    ttl: Optional[timedelta] = None,
+) -> Reservation:
+    """
+    Take stock for a basket of BasketItem all-or-nothing and record the
+    reservation (caller commits). 409 naming the short products otherwise.
+    """
+    basket: dict[int, int] = {}
+    for item in items:
+        basket[item.product_id] = basket.get(item.product_id, 0) + item.qty
+
+    reserved = set((await session.exec(reserve_statement(basket))).scalars().all())
+    short = sorted(set(basket) - reserved)
+    if short:
+        await session.rollback()
+        api_response(
+            409, f"Not enough stock for product {', '.join(map(str, short))}"
+        )
+
+    expires_at = datetime.now(timezone.utc) + (
+        ttl or timedelta(minutes=RESERVATION_TTL_MINUTES)
+    )
+    reservation = Reservation(user_id=user_id, expires_at=expires_at)
+    reservation.items = [
+        ReservationItem(product_id=id, qty=qty) for id, qty in sorted(basket.items())
+    ]
+    session.add(reservation)
+    await session.flush()
+    return reservation
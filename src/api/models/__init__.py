@@ -3,6 +3,15 @@ from .userModel import User
 from .categoryModel import Category
 from .ratingModel import Rating
 from .productModel import Product
+from .reservationModel import Reservation, ReservationItem
 
 
-__all__ = ["User", "Role", "Category", "Rating", "Product"]
+__all__ = [
+    "User",
+    "Role",
+    "Category",
+    "Rating",
+    "Product",
+    "Reservation",
+    "ReservationItem",
+]
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -14,3 +15,29 @@ class TimeStampReadModel(SQLModel):
     updated_at: Optional[datetime] = None
 
     # model_config = ConfigDict(from_attributes=True)
+
+
+def searchable_indexes(table: str, *columns: str) -> tuple[Index, ...]:
+    """
+    Indexes for columns searched by the list layer (Postgres):
+      ix_<table>_<col>_trgm   -> pg_trgm GIN, serves ILIKE '%term%'
+      ix_<table>_<col>_prefix -> text_pattern_ops btree, serves LIKE 'term%'
+    """
+    indexes = []
+    for column in columns:
+        indexes.append(
+            Index(
+                f"ix_{table}_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+        )
+        indexes.append(
+            Index(
+                f"ix_{table}_{column}_prefix",
+                column,
+                postgresql_ops={column: "text_pattern_ops"},
+            )
+        )
+    return tuple(indexes)
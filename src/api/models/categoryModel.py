@@ -3,10 +3,15 @@ from typing import List, Optional
 
 from pydantic import BaseModel
 from sqlmodel import Field, Relationship, SQLModel
-from src.api.models.baseModel import TimeStampReadModel, TimeStampedModel
+from src.api.models.baseModel import (
+    TimeStampReadModel,
+    TimeStampedModel,
+    searchable_indexes,
+)
 
 
 class Category(TimeStampedModel, table=True):
+    __table_args__ = searchable_indexes("category", "title")
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(index=True, unique=True, max_length=100)
     description: Optional[str] = None
@@ -1,14 +1,26 @@
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import JSON, Column
+from pydantic import model_validator
+from sqlalchemy import JSON, Column, Computed, Float, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import Field, Relationship, SQLModel
-from src.api.models.baseModel import TimeStampReadModel, TimeStampedModel
+from src.api.models.baseModel import (
+    TimeStampReadModel,
+    TimeStampedModel,
+    searchable_indexes,
+)
 from src.api.models.userModel import UserReadBase
 from src.api.models.categoryModel import Category, CategoryRead
 from src.api.models.ratingModel import Rating
 
 
 class Product(TimeStampedModel, table=True):
+    # searchTerm uses this tsvector column (title > category > description),
+    # kept up to date by database triggers, instead of ilike over searchFields
+    __search_document__ = "search_vector"
+    __search_config__ = "english"
+    __table_args__ = searchable_indexes("product", "title")
+
     id: Optional[int] = Field(default=None, primary_key=True)
 
     user_id: int = Field(foreign_key="user.id")
@@ -22,12 +34,63 @@ class Product(TimeStampedModel, table=True):
     stock: int = Field(default=0)
     is_active: bool = Field(default=True)
 
+    # Rating aggregates, maintained with SQL arithmetic by the rating routes
+    # (reconcile: python -m src.scripts.reconcile_ratings)
+    rating_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_sum: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_1: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_2: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_3: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_4: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_5: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    avg_rating: Optional[float] = Field(
+        default=None,
+        sa_column=Column(
+            Float,
+            Computed(
+                "CASE WHEN rating_count > 0 "
+                "THEN CAST(rating_sum AS FLOAT) / rating_count END",
+                persisted=True,
+            ),
+        ),
+    )
+
     # Relationships
     user: Optional["User"] = Relationship(back_populates="products")
     category: Optional["Category"] = Relationship(back_populates="products")
     ratings: List["Rating"] = Relationship(back_populates="product")
 
 
+RATING_SCORES = range(1, 6)
+
+
+def rating_histogram(product) -> dict[str, int]:
+    """{"1": n, ..., "5": n} from the rating_1..rating_5 columns (row or model)."""
+    return {str(score): getattr(product, f"rating_{score}") for score in RATING_SCORES}
+
+
+# Left unmapped on purpose: select(Product) never loads it, triggers fill it
+Product.__table__.append_column(Column("search_vector", TSVECTOR, nullable=True))
+Index(
+    "ix_product_search_vector",
+    Product.__table__.c.search_vector,
+    postgresql_using="gin",
+)
+# sort=-avg_rating / -rating_count and their keyset seeks (same order as applySort)
+Index(
+    "ix_product_avg_rating",
+    Product.__table__.c.avg_rating.desc().nulls_last(),
+    Product.__table__.c.id.desc(),
+)
+Index(
+    "ix_product_rating_count_desc",
+    Product.__table__.c.rating_count.desc().nulls_last(),
+    Product.__table__.c.id.desc(),
+)
+# ascending sort=rating_count and numberRange filters on it
+Index("ix_product_rating_count", Product.__table__.c.rating_count, Product.__table__.c.id)
+
+
 class ProductCreate(SQLModel):
     category_id: int
     title: str = Field(max_length=100)
@@ -49,6 +112,28 @@ class ProductUpdate(SQLModel):
     is_active: Optional[bool] = None
 
 
+class ProductBulkUpdate(SQLModel):
+    """One /product/update-many row: only the fields sent are written."""
+
+    id: int
+    price: Optional[float] = None
+    sale_price: Optional[float] = None
+    stock: Optional[int] = None
+    is_active: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_not_null(self):
+        # optional to send, but NOT NULL columns: an explicit null is an error
+        nulls = [
+            name
+            for name in ("price", "stock", "is_active")
+            if name in self.model_fields_set and getattr(self, name) is None
+        ]
+        if nulls:
+            raise ValueError(f"{', '.join(nulls)} cannot be null")
+        return self
+
+
 class ProductRead(TimeStampReadModel):
     id: int
     user_id: int
@@ -63,6 +148,7 @@ class ProductRead(TimeStampReadModel):
     category: Optional[CategoryRead] = None
     # ratings: Optional[List[Rating]] = None
     avg_rating: Optional[float] = None
+    rating_count: int = 0
 
     class Config:
         from_attributes = True
@@ -1,6 +1,7 @@
 from typing import List, Optional
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel, UniqueConstraint
-from src.api.models.baseModel import TimeStampedModel
+from src.api.models.baseModel import TimeStampReadModel, TimeStampedModel
 
 
 class Rating(TimeStampedModel, table=True):
@@ -18,6 +19,22 @@ class Rating(TimeStampedModel, table=True):
     user: Optional["User"] = Relationship(back_populates="ratings")
 
 
+# one product's reviews, newest / best first: same ORDER BY as applySort
+# for -created_at / -score ((column DESC NULLS LAST, id DESC)), keyset too
+Index(
+    "ix_rating_product_created",
+    Rating.__table__.c.product_id,
+    Rating.__table__.c.created_at.desc().nulls_last(),
+    Rating.__table__.c.id.desc(),
+)
+Index(
+    "ix_rating_product_score",
+    Rating.__table__.c.product_id,
+    Rating.__table__.c.score.desc().nulls_last(),
+    Rating.__table__.c.id.desc(),
+)
+
+
 class RatingCreate(SQLModel):
     score: int = Field(ge=1, le=5)
     comment: Optional[str] = None
@@ -31,9 +48,21 @@ class RatingUpdate(SQLModel):
 class ProductRatingRead(SQLModel):
     product_id: int
     avg_rating: Optional[float] = 0
+    rating_count: int = 0
+    histogram: Optional[dict[str, int]] = None  # {"1": n, ..., "5": n}
+
+
+class RatingRead(TimeStampReadModel):
+    id: int
+    score: int
+    comment: Optional[str] = None
+    product_id: int
+    user_id: int
 
 
 class ProductAllRating(SQLModel):
     id: int
     avg_rating: Optional[float] = 0
-    ratings: Optional[List[Rating]] = None
+    rating_count: int = 0
+    histogram: Optional[dict[str, int]] = None
+    ratings: Optional[List[RatingRead]] = None  # one page
@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Index, text
+from sqlmodel import Field, Relationship, SQLModel
+from src.api.models.baseModel import TimeStampReadModel, TimeStampedModel
+
+# held -> checked_out (paid), released (cancelled) or expired (stock returned)
+RESERVATION_STATUSES = ("held", "checked_out", "released", "expired")
+
+
+class Reservation(TimeStampedModel, table=True):
+    __table_args__ = (
+        # the expiry sweep only looks at reservations still holding stock
+        Index(
+            "ix_reservation_held_expires_at",
+            "expires_at",
+            postgresql_where=text("status = 'held'"),
+        ),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    status: str = Field(default="held", max_length=20)
+    expires_at: datetime
+
+    items: List["ReservationItem"] = Relationship(back_populates="reservation")
+
+
+class ReservationItem(SQLModel, table=True):
+    __tablename__ = "reservation_item"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    reservation_id: int = Field(foreign_key="reservation.id", index=True)
+    # a deleted product takes its reservation lines with it (every delete
+    # path: /product/delete, /product/delete-many, category cascade)
+    product_id: int = Field(foreign_key="product.id", ondelete="CASCADE", index=True)
+    qty: int
+
+    reservation: Optional[Reservation] = Relationship(back_populates="items")
+
+
+class BasketItem(SQLModel):
+    product_id: int
+    qty: int = Field(gt=0)
+
+
+class ReservationCreate(SQLModel):
+    items: List[BasketItem] = Field(min_length=1)
+
+
+class ReservationItemRead(SQLModel):
+    product_id: int
+    qty: int
+
+    class Config:
+        from_attributes = True
+
+
+class ReservationRead(TimeStampReadModel):
+    id: int
+    user_id: int
+    status: str
+    expires_at: datetime
+    items: List[ReservationItemRead] = []
+
+    class Config:
+        from_attributes = True
@@ -2,17 +2,24 @@ from typing import List, Optional
 from sqlalchemy import JSON
 from sqlmodel import Field, Relationship, SQLModel
 
-from src.api.models.baseModel import TimeStampedModel, TimeStampReadModel
+from src.api.models.baseModel import (
+    TimeStampedModel,
+    TimeStampReadModel,
+    searchable_indexes,
+)
 
 
 class Role(TimeStampedModel, table=True):
     __tablename__ = "user_role"
+    __table_args__ = searchable_indexes("user_role", "title")
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(max_length=50, unique=True)
     permissions: list[str] = Field(
         default_factory=list,
         sa_type=JSON,
     )
+    # bumped by every /role/update; tokens carry it so workers notice changes
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
     users: List["User"] = Relationship(back_populates="role")
 
 
@@ -20,6 +27,7 @@ class RoleRead(TimeStampReadModel):
     id: int
     title: str
     permissions: list[str]
+    version: int
 
 
 class RoleCreate(SQLModel):
@@ -2,11 +2,16 @@ from typing import Annotated, List, Optional
 
 from pydantic import EmailStr, model_validator, StringConstraints
 from sqlmodel import Field, Relationship, SQLModel
-from src.api.models.baseModel import TimeStampedModel, TimeStampReadModel
+from src.api.models.baseModel import (
+    TimeStampedModel,
+    TimeStampReadModel,
+    searchable_indexes,
+)
 from src.api.models.roleModel import RoleRead
 
 
 class User(TimeStampedModel, table=True):
+    __table_args__ = searchable_indexes("user", "email", "full_name", "phone")
     id: Optional[int] = Field(default=None, primary_key=True)
     full_name: str = Field(max_length=50)
     email: EmailStr
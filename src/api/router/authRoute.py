@@ -3,18 +3,18 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 from fastapi import APIRouter, Request, Response
 from src.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from src.api.core.permission_registry import permission_registry
 from src.api.core.security import (
     create_access_token,
-    decode_token,
-    exist_user,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    role_claims,
+    verify_password_async,
     verify_refresh_token,
 )
 from src.api.models.roleModel import Role
 from src.api.models.userModel import RegisterUser, User, UserRead, LoginRequest
 from src.api.core import (
-    GetSession,
+    AsyncGetSession,
     api_response,
     requireSignin,
     requireAdmin,
@@ -26,12 +26,12 @@ router = APIRouter(tags=["Auth"])
 
 
 @router.post("/init", response_model=UserRead)
-def initialize_first_user(
+async def initialize_first_user(
     request: RegisterUser,
-    session: GetSession,
+    session: AsyncGetSession,
 ):
     # Prevent rerun if roles already exist
-    existing_roles = session.exec(select(Role)).all()
+    existing_roles = (await session.exec(select(Role))).all()
     if existing_roles:
         return api_response(
             400,
@@ -50,10 +50,10 @@ def initialize_first_user(
 
     session.add(admin_role)
     session.add(user_role)
-    session.flush()  # get IDs without committing
+    await session.flush()  # get IDs without committing
 
     # Create first user with admin role
-    hashed_password = hash_password(request.password)
+    hashed_password = await hash_password_async(request.password)
     user = User(**request.model_dump())
     user = User(
         full_name=request.full_name,
@@ -62,8 +62,8 @@ def initialize_first_user(
         role_id=admin_role.id,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     user_read = UserRead.model_validate(user)
     return api_response(
@@ -74,22 +74,24 @@ def initialize_first_user(
 
 
 @router.post("/register", response_model=UserRead)  # ✅ Added "@"
-def register_user(
+async def register_user(
     request: RegisterUser,
-    session: GetSession,
+    session: AsyncGetSession,
 ):
-    db_user = exist_user(session, email=request.email)
+    db_user = (
+        await session.exec(select(User).where(User.email == request.email))
+    ).first()
     if db_user:
         return api_response(
             400,
             "This user already exist",
         )
     user = User(**request.model_dump())  # Similar to new User(req.body) in Mongoose
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
     user.password = hashed_password
     session.add(user)
-    session.commit()
-    session.refresh(user)  # Refresh to get updated fields (e.g., autogenerated ID)
+    await session.commit()
+    await session.refresh(user)  # Refresh to get updated fields (e.g., autogenerated ID)
     user_read = UserRead.model_validate(user)  # ✅ Convert User → UserRead
     return api_response(
         200,
@@ -99,37 +101,44 @@ def register_user(
 
 
 @router.post("/login", response_model=dict)
-def login_user(
+async def login_user(
     request: LoginRequest,
     response: Response,
-    session: GetSession,
+    session: AsyncGetSession,
 ):
     user = (
-        session.exec(
-            select(User)
-            .options(selectinload(User.role))
-            .where(User.email == request.email)
+        (
+            await session.exec(
+                select(User)
+                .options(selectinload(User.role))
+                .where(User.email == request.email)
+            )
         )
         .scalars()
         .first()
     )
     if not user:
         return api_response(404, "User not found")
-    if not verify_password(request.password, user.password):
+    verified, new_hash = await verify_password_async(request.password, user.password)
+    if not verified:
         return api_response(401, "Incorrect password")
+    if new_hash:
+        # stored with an old scheme/cost: upgrade it while we have the password
+        user.password = new_hash
+        await session.commit()
 
     if not user.is_active:
         return api_response(403, "User account is disabled")
 
     # Handle missing role gracefully
-    role_title = user.role.title if user.role else None
-    permissions = user.role.permissions if user.role and user.role.permissions else []
+    if user.role:
+        permission_registry.upsert(user.role)
 
+    # permissions stay out of the token, require_permission looks them up
     user_data = {
         "id": user.id,
         "email": user.email,
-        "role": role_title,
-        "permissions": permissions,
+        **role_claims(user.role),
     }
     access_token = create_access_token(user_data=user_data)
     refresh_token = create_access_token(user_data=user_data, refresh=True)
@@ -162,19 +171,37 @@ def login_user(
 @router.post(
     "/refresh",
 )
-def refresh_token(
+async def refresh_token(
     refresh_token: str,
+    session: AsyncGetSession,
 ):
     if not refresh_token:
         api_response(401, "Missing refresh token")
 
     payload = verify_refresh_token(refresh_token)
-    if not payload:
-        raise api_response(401, "Invalid refresh token")
-    user = decode_token(refresh_token)
-    # user = UserRead.model_validate(db_user)
-    access_token = create_access_token(user)
-    new_refresh_token = create_access_token(user_data=user, refresh=True)
+    if not payload or payload.get("refresh") is not True:
+        api_response(401, "Invalid refresh token")
+
+    # claims are re-read from the user row: a token issued before the
+    # registry (role / permissions embedded) comes back with role_id only
+    user_id = (payload.get("user") or {}).get("id")
+    user = user_id and await session.get(
+        User, user_id, options=[selectinload(User.role)]
+    )
+    if not user:
+        api_response(401, "Invalid refresh token")
+    if not user.is_active:
+        api_response(403, "User account is disabled")
+    if user.role:
+        permission_registry.upsert(user.role)
+
+    user_data = {
+        "id": user.id,
+        "email": user.email,
+        **role_claims(user.role),
+    }
+    access_token = create_access_token(user_data)
+    new_refresh_token = create_access_token(user_data=user_data, refresh=True)
 
     return api_response(
         200,
@@ -182,7 +209,7 @@ def refresh_token(
         {
             "access_token": access_token,
             "refresh_token": new_refresh_token,
-            "user": user,
+            "user": user_data,
         },
     )
 
@@ -1,9 +1,19 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy import select
-from src.api.core.dependencies import ListQueryParams
+from fastapi import APIRouter, Depends, Query, Request
+# aliased: this module's route handlers are named delete / update
+from sqlalchemy import delete as sql_delete, func, literal, update as sql_update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from src.config import CATEGORY_DELETE_PRODUCTS
+from src.api.core.dependencies import IfNoneMatch, ListQueryParams
 from src.api.core.utility import Print
-from src.api.core.operation import listRecords, updateOp
+from src.api.core.operation import (
+    exportRecordsAsync,
+    listParams,
+    listopAsync,
+    updateOp,
+)
+from src.api.core.operation.projection_helper import project_rows
 from src.api.core.response import api_response, raiseExceptions
 from src.api.models.categoryModel import (
     Category,
@@ -12,71 +22,129 @@ from src.api.models.categoryModel import (
     CategoryReadNested,
     CategoryUpdate,
 )
-from src.api.core.dependencies import GetSession, requirePermission
-from sqlalchemy.orm import selectinload
+from src.api.core.dependencies import AsyncGetSession, requirePermission
+from src.api.core.cache import cache_key, cachedResponse, invalidate
+from src.api.core.category_tree import category_tree
+from src.api.models.productModel import Product
+from src.api.models.ratingModel import Rating
+from src.api.core.conditional import (
+    listVersionStatements,
+    notModified,
+    recordVersionStatements,
+    rowsETag,
+    versionRowsAsync,
+    withETag,
+)
 
 router = APIRouter(prefix="/category", tags=["Category"])
 
+# what /delete-parent does with products filed under the deleted categories
+CATEGORY_DELETE_POLICIES = ("restrict", "cascade", "reparent")
+
+
+async def loadTree(session, version: tuple = None):
+    """
+    Process-wide category index, (re)loaded through this session if needed.
+    `version`: the category table's (count, max updated_at) row the ETag was
+    built from; the index reloads when it was loaded at another version, so
+    another worker's write never pairs a new ETag with an old tree.
+    """
+    return await session.run_sync(
+        category_tree.ensure, tuple(version) if version else None
+    )
+
 
 @router.post("/create")
-def create(
-    request: CategoryCreate, session: GetSession, user=requirePermission("category")
+async def create(
+    request: CategoryCreate,
+    session: AsyncGetSession,
+    user=requirePermission("category"),
 ):
     data = Category(**request.model_dump())
     Print(data, "data")
     session.add(data)
-    session.commit()
-    session.refresh(data)
+    await session.commit()
+    invalidate("category")
+    await session.refresh(data)
+    category_tree.upsert(data)
     return api_response(
         200, "Category Created Successfully", CategoryRead.model_validate(data)
     )
 
 
 @router.put("/update/{id}")
-def update(
+async def update(
     id: int,
     request: CategoryUpdate,
-    session: GetSession,
+    session: AsyncGetSession,
     user=requirePermission("category"),
 ):
 
-    updateData = session.get(Category, id)  # Like findById
+    updateData = await session.get(Category, id)  # Like findById
     raiseExceptions((updateData, 404, "Category not found"))
     updateOp(updateData, request, session)
 
-    session.commit()
-    session.refresh(updateData)
-    return api_response(
-        200,
-        "Category Update Successfully",
-        CategoryReadNested.model_validate(updateData),
-    )
+    await session.commit()
+    invalidate("category")
+    await session.refresh(updateData)
+    category_tree.upsert(updateData)
+    tree = await loadTree(session)
+    return api_response(200, "Category Update Successfully", tree.subtree(id))
 
 
 @router.get("/read/{id}", response_model=CategoryReadNested)
-def get(
+async def get(
     id: int,
-    session: GetSession,
+    session: AsyncGetSession,
+    if_none_match: IfNoneMatch = None,
     user=requirePermission("category"),
 ):
+    # [the row, the category table (children)]
+    versions = await versionRowsAsync(
+        session, recordVersionStatements(Category, id, CategoryReadNested)
+    )
+    etag = rowsETag(versions)
+    if response := notModified(etag, if_none_match):
+        return response
+
+    async def read_category():
+        tree = await loadTree(session, versions[-1])
+        read = tree.subtree(id)  # whole subtree from memory
+        raiseExceptions((read, 404, "Category not found"))
 
-    read = session.get(Category, id)  # Like findById
-    raiseExceptions((read, 404, "Category not found"))
+        return api_response(200, "Category Found", read)
 
-    return api_response(200, "Category Found", CategoryReadNested.model_validate(read))
+    # keyed by the ETag too: a body cached before another worker's write is
+    # never served under the new ETag
+    key = cache_key("category:read", {"id": id, "etag": etag}, user)
+    return withETag(await cachedResponse(key, ("category",), read_category), etag)
+
+
+@router.get("/breadcrumbs/{id}", response_model=list[CategoryRead])
+async def breadcrumbs(
+    id: int,
+    session: AsyncGetSession,
+    user=requirePermission("category"),
+):
+    tree = await loadTree(session)
+    path = tree.breadcrumbs(id)  # root ... category, no query once loaded
+    raiseExceptions((path, 404, "Category not found"))
+    return api_response(200, "Category found", path)
 
 
 # ❗ DELETE
 @router.delete("/delete/{id}", response_model=dict)
-def delete(
+async def delete(
     id: int,
-    session: GetSession,
+    session: AsyncGetSession,
     user=requirePermission("category-delete"),
 ):
-    category = session.get(Category, id)
+    category = await session.get(Category, id)
     raiseExceptions((category, 404, "category not found"))
 
-    children = session.exec(select(Category).where(Category.parent_id == id)).all()
+    children = (
+        await session.exec(select(Category).where(Category.parent_id == id))
+    ).all()
     raiseExceptions(
         (
             len(children) > 0,
@@ -85,98 +153,200 @@ def delete(
             True,
         )
     )
-    session.delete(category)
-    session.commit()
+    await session.delete(category)
+    await session.commit()
+    invalidate("category")
+    category_tree.remove(id)
     return api_response(404, f"Category {category.title} deleted")
 
 
-def delete_category_tree(session, category_id: int):
+def delete_subtree_statement(category_id: int, products: str, parent_id=None):
     """
-    Recursively delete a category and all its children.
+    One statement deleting a category and every descendant (WITH RECURSIVE);
+    products attached to them are handled by data-modifying CTEs of the same
+    statement. Rows: (id, "category") per deleted category and
+    (id, "product") per deleted / moved product.
     """
-    # Get all direct children
-    children = (
-        session.exec(select(Category).where(Category.parent_id == category_id))
-        .scalars()
-        .all()
+    category, product, rating = (
+        Category.__table__,
+        Product.__table__,
+        Rating.__table__,
+    )
+    subtree = (
+        select(category.c.id)
+        .where(category.c.id == category_id)
+        .cte("subtree", recursive=True)
     )
+    # UNION (not ALL) stops on a parent_id cycle instead of recursing forever
+    subtree = subtree.union(
+        select(category.c.id).where(category.c.parent_id == subtree.c.id)
+    )
+    in_subtree = product.c.category_id.in_(select(subtree.c.id))
 
-    # Recursively delete children first
-    for child in children:
-        print("+++++++++++++++++++++++++", child)
-        delete_category_tree(session, child.id)
+    deleted = (
+        sql_delete(category)
+        .where(category.c.id.in_(select(subtree.c.id)))
+        .returning(category.c.id)
+        .cte("deleted_categories")
+    )
+    statement = select(deleted.c.id, literal("category").label("kind"))
 
-    # Finally delete this category
-    category = session.get(Category, category_id)
-    if category:
-        session.delete(category)
+    # restrict: nothing here, the product foreign key rejects the statement
+    if products == "cascade":
+        doomed = select(product.c.id).where(in_subtree)
+        ratings = sql_delete(rating).where(rating.c.product_id.in_(doomed))
+        affected = sql_delete(product).where(in_subtree).returning(product.c.id)
+        statement = statement.add_cte(ratings.cte("deleted_ratings"))
+    elif products == "reparent":
+        affected = (
+            sql_update(product)
+            .where(in_subtree)
+            .values(category_id=parent_id, updated_at=func.now())
+            .returning(product.c.id)
+        )
+    if products in ("cascade", "reparent"):
+        affected = affected.cte("affected_products")
+        statement = statement.union_all(select(affected.c.id, literal("product")))
+    return statement
 
 
 @router.delete("/delete-parent/{id}")
-def deleteMany(
+async def deleteMany(
     id: int,
-    session: GetSession,
+    session: AsyncGetSession,
+    products: str = Query(
+        CATEGORY_DELETE_PRODUCTS,
+        description="Products in the subtree: 'restrict', 'cascade' or 'reparent'",
+    ),
     user=requirePermission("category-delete"),
 ):
-    category = session.get(Category, id)
+    raiseExceptions(
+        (
+            products in CATEGORY_DELETE_POLICIES,
+            400,
+            "products must be 'restrict', 'cascade' or 'reparent'",
+        )
+    )
+    category = await session.get(Category, id)
     raiseExceptions((category, 404, "category not found"))
-    # Recursively delete this category and all its children
-    delete_category_tree(session, id)
-    session.commit()
+    raiseExceptions(
+        (
+            products == "reparent" and category.parent_id is None,
+            400,
+            "A root category has no parent to move its products to",
+            True,
+        )
+    )
+    title, parent_id = category.title, category.parent_id
+
+    # Subtree + products in a single statement / round-trip
+    statement = delete_subtree_statement(id, products, parent_id)
+    try:
+        rows = (await session.exec(statement)).all()
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        api_response(
+            409,
+            f"Category tree '{title}' still has products, "
+            "delete with products='cascade' or 'reparent'",
+        )
+
+    deleted = [row_id for row_id, kind in rows if kind == "category"]
+    product_ids = [row_id for row_id, kind in rows if kind == "product"]
+
+    invalidate("category")
+    if product_ids:
+        invalidate("product:list", *[f"product:{pid}" for pid in product_ids])
+    category_tree.remove(id)
 
     return api_response(
-        200, f"Category tree with root {category.title} deleted successfully"
+        200,
+        f"Category tree with root {title} deleted successfully",
+        {
+            "deleted": deleted,
+            "products": {"policy": products, "affected": product_ids},
+        },
     )
 
 
 # ✅ LIST
 @router.get("/list", response_model=list[CategoryReadNested])
-def list(
+async def list(
+    query_params: ListQueryParams,
+    session: AsyncGetSession,
+    if_none_match: IfNoneMatch = None,
+    user=requirePermission("category"),
+):
+    query_params = vars(query_params)
+    searchFields = [
+        "title",
+    ]
+    # [the filtered set, the category table (children)]
+    versions = await versionRowsAsync(
+        session,
+        listVersionStatements(
+            Category, query_params, searchFields, CategoryReadNested
+        ),
+    )
+    etag = rowsETag(versions, query_params)
+    if response := notModified(etag, if_none_match):
+        return response
+
+    async def build_tree():
+        params = listParams(query_params, CategoryRead)
+        filters = ("searchTerm", "columnFilters", "dateRange", "numberRange")
+        if not any(query_params.get(name) for name in filters):
+            # Unfiltered: page over the root categories
+            params["filters"]["where"] = [Category.parent_id.is_(None)]
+        # sort, cursor, countMode and fields apply to the matches / roots
+        result = await listopAsync(
+            session, Model=Category, searchFields=searchFields, **params
+        )
+        raiseExceptions((result["data"], 404, "No Result found"))
+
+        if params["fields"]:
+            # sparse fieldset: the requested columns only, no subtrees
+            data = project_rows(result["data"], params["fields"])
+        else:
+            # the index renders each match with its subtree (matches below
+            # another match stay nested)
+            tree = await loadTree(session, versions[-1])
+            matched = {c.id for c in result["data"]}
+            data = tree.tree(
+                [
+                    c.id
+                    for c in result["data"]
+                    if c.id in tree.nodes
+                    and matched.isdisjoint(tree.nodes[c.id].ancestors)
+                ]
+            )
+        return api_response(
+            200,
+            "Category found",
+            data,
+            result["total"],
+            next_cursor=result.get("next_cursor"),
+        )
+
+    key = cache_key("category:list", {**query_params, "etag": etag}, user)
+    return withETag(await cachedResponse(key, ("category",), build_tree), etag)
+
+
+@router.get("/export")
+async def export(
     query_params: ListQueryParams,
+    format: str = Query("ndjson", description="'ndjson' or 'csv'"),
     user=requirePermission("category"),
 ):
     query_params = vars(query_params)
     searchFields = [
         "title",
     ]
-    result = listRecords(
+    return await exportRecordsAsync(
         query_params=query_params,
         searchFields=searchFields,
         Model=Category,
-        join_options=[selectinload(Category.children)],
+        Schema=CategoryRead,
+        format=format,
     )
-    categories = result["data"]
-    if (
-        categories and categories[0].parent_id
-    ):  # assuming your search result is in `categories`
-        # Treat the first search result as root by ignoring its parent
-        categories[0].parent_id = None
-    category_map = {
-        c.id: CategoryReadNested(
-            id=c.id,
-            title=c.title,
-            description=c.description,
-            parent_id=c.parent_id,
-            created_at=c.created_at,
-            updated_at=c.updated_at,
-            children=[],
-        )
-        for c in categories
-    }
-    roots = []
-
-    # Step 1: attach children
-    for cat in category_map.values():
-        if cat.parent_id and cat.id != cat.parent_id:  # has a parent
-            parent = category_map.get(cat.parent_id)
-            if parent:
-                if not any(child.id == cat.id for child in parent.children):
-                    parent.children.append(cat)
-        # ❌ DO NOT append to roots here
-
-    # Step 2: collect only roots
-    for cat in category_map.values():
-        if not cat.parent_id:  # no parent_id means it's a root
-            roots.append(cat)
-
-    return api_response(200, "Category found", roots, result["total"])
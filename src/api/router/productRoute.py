@@ -1,55 +1,272 @@
-from fastapi import APIRouter
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Body, Query, Request
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    delete as sql_delete,
+    insert,
+    func,
+    literal,
+    or_,
+    update as sql_update,
+    values as sql_values,
+)
+from sqlalchemy.sql import column
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import BULK_CHUNK_SIZE
 from src.api.core.dependencies import (
-    GetSession,
+    AsyncGetSession,
+    IfNoneMatch,
     ListQueryParams,
     requireSignin,
     requirePermission,
 )
-from src.api.core.operation import listRecords, updateOp
+from src.api.core.operation import (
+    exportRecordsAsync,
+    listRecordsAsync,
+    updateOp,
+)
+from src.api.core.operation.bulk_helper import (
+    chunked,
+    request_items,
+    validate_items,
+)
+from src.api.core.operation.eager_helper import eager_options
+from src.api.core.cache import cache_key, cachedResponse, invalidate
+from src.api.core.conditional import (
+    PUBLIC_CACHE,
+    listPageETagAsync,
+    notModified,
+    recordVersionStatements,
+    versionETagAsync,
+    withETag,
+)
 from src.api.core.response import api_response, raiseExceptions
+from src.api.models.categoryModel import Category
 from src.api.models.productModel import (
     Product,
+    ProductBulkUpdate,
     ProductCreate,
     ProductRead,
     ProductUpdate,
 )
+from src.api.models.ratingModel import Rating
 from sqlalchemy.orm import selectinload
 
 router = APIRouter(prefix="/product", tags=["Product"])
 
 
+def product_tags(id: int = None) -> tuple:
+    """Response cache tags: one product or the lists, both embed category/user."""
+    return (f"product:{id}" if id else "product:list", "category", "user")
+
+
 @router.post("/create")
-def create(request: ProductCreate, session: GetSession, user: requireSignin):
+async def create(
+    request: ProductCreate, session: AsyncGetSession, user: requireSignin
+):
     data = Product(**request.model_dump())
     data.user_id = user.get("id")
     session.add(data)
-    session.commit()
-    session.refresh(data)
+    await session.commit()
+    invalidate("product:list")
+    data = await session.get(
+        Product,
+        data.id,
+        options=eager_options(Product, ProductRead),
+        populate_existing=True,
+    )
     return api_response(
         200, "Product Created Successfully", ProductRead.model_validate(data)
     )
 
 
+# /create-many body for the docs: JSON array or NDJSON of ProductCreate
+CREATE_MANY_BODY = {
+    "required": True,
+    "content": {
+        "application/json": {
+            "schema": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/ProductCreate"},
+            }
+        },
+        "application/x-ndjson": {
+            "schema": {"$ref": "#/components/schemas/ProductCreate"}
+        },
+    },
+}
+
+
+# /update-many body for the docs, same layout as /create-many (no route
+# takes ProductBulkUpdate directly, so its schema is inlined)
+UPDATE_MANY_BODY = {
+    "required": True,
+    "content": {
+        "application/json": {
+            "schema": {
+                "type": "array",
+                "items": ProductBulkUpdate.model_json_schema(),
+            }
+        },
+        "application/x-ndjson": {"schema": ProductBulkUpdate.model_json_schema()},
+    },
+}
+
+
+async def insert_products(
+    session: AsyncSession, rows: list, user_id: int
+) -> tuple[list[dict], list[dict]]:
+    """
+    One chunk of validated [(index, ProductCreate)] -> (created, failed).
+    Categories are checked with one query, the rest goes in as a single
+    multi-row INSERT ... RETURNING id and its own transaction.
+    """
+    category_ids = {row.category_id for _, row in rows}
+    statement = select(Category.id).where(Category.id.in_(category_ids))
+    known = set((await session.exec(statement)).all())
+    failed = [
+        {
+            "index": index,
+            "reason": "category not found",
+            "category_id": row.category_id,
+        }
+        for index, row in rows
+        if row.category_id not in known
+    ]
+    rows = [(index, row) for index, row in rows if row.category_id in known]
+    if not rows:
+        return [], failed
+
+    now = datetime.now(timezone.utc)
+    values = [
+        {**row.model_dump(), "user_id": user_id, "created_at": now} for _, row in rows
+    ]
+    product = Product.__table__
+    statement = insert(product).returning(product.c.id, sort_by_parameter_order=True)
+    try:
+        ids = (await session.exec(statement, params=values)).scalars().all()
+        await session.commit()
+    except (IntegrityError, DataError):
+        # e.g. a category deleted meanwhile or a value out of the column's
+        # range: retry row by row to keep the rest
+        await session.rollback()
+        ids = []
+        for (index, _), value in zip(rows, values):
+            try:
+                async with session.begin_nested():
+                    result = await session.exec(statement, params=[value])
+                    ids.append(result.scalar_one())
+            except (IntegrityError, DataError):
+                ids.append(None)
+                failed.append({"index": index, "reason": "rejected by the database"})
+        await session.commit()
+
+    created = [
+        {"index": index, "id": id}
+        for (index, _), id in zip(rows, ids)
+        if id is not None
+    ]
+    return created, failed
+
+
+@router.post(
+    "/create-many",
+    response_model=dict,
+    openapi_extra={"requestBody": CREATE_MANY_BODY},
+)
+async def create_many(
+    request: Request, session: AsyncGetSession, user: requireSignin
+):
+    """
+    JSON array of ProductCreate, or NDJSON (Content-Type: application/x-ndjson)
+    streamed in BULK_CHUNK_SIZE chunks. Bad rows are reported by index, the
+    others are created.
+    """
+    created, failed, requested = [], [], 0
+    async for chunk in chunked(request_items(request), BULK_CHUNK_SIZE):
+        requested += len(chunk)
+        rows, invalid = validate_items(ProductCreate, chunk)
+        failed.extend(invalid)
+        if rows:
+            inserted, rejected = await insert_products(session, rows, user.get("id"))
+            created.extend(inserted)
+            failed.extend(rejected)
+
+    if created:
+        invalidate("product:list")
+    failed.sort(key=lambda item: item["index"])
+    return api_response(
+        200,
+        "Bulk create processed",
+        {
+            "created": created,
+            "failed": failed,
+            "summary": {
+                "requested": requested,
+                "created_count": len(created),
+                "failed_count": len(failed),
+            },
+        },
+    )
+
+
 @router.get("/read/{id}", response_model=ProductRead)
-def findOne(id: int, session: GetSession, auth=requirePermission("product")):
+async def findOne(
+    id: int,
+    session: AsyncGetSession,
+    if_none_match: IfNoneMatch = None,
+    auth=requirePermission("product"),
+):
+    etag = await versionETagAsync(
+        session, recordVersionStatements(Product, id, ProductRead)
+    )
+    if response := notModified(etag, if_none_match):
+        return response
+
+    async def read_product():
+        read = await session.get(
+            Product, id, options=eager_options(Product, ProductRead)
+        )  # Like findById
+        raiseExceptions((read, 404, "Product not found"))
 
-    read = session.get(Product, id)  # Like findById
-    raiseExceptions((read, 404, "Product not found"))
+        return api_response(200, "Product Found", ProductRead.model_validate(read))
 
-    return api_response(200, "Product Found", ProductRead.model_validate(read))
+    key = cache_key("product:read", {"id": id, "etag": etag}, auth)
+    return withETag(
+        await cachedResponse(key, product_tags(id), read_product), etag
+    )
 
 
 @router.put("/update/{id}", response_model=dict)
-def updateOne(
-    id: int, request: ProductUpdate, session: GetSession, user: requireSignin
+async def updateOne(
+    id: int, request: ProductUpdate, session: AsyncGetSession, user: requireSignin
 ):
-    product = session.get(Product, id)
+    product = await session.get(
+        Product, id, options=eager_options(Product, ProductRead)
+    )
     raiseExceptions((product, 404, "Product not found"))
     print(user.get("id") != product.user_id)
     role = user.get("role")
 
     if role == "admin" or user.get("id") == product.user_id:
         updateProduct = updateOp(product, request, session)
+        await session.commit()
+        invalidate("product:list", f"product:{id}")
+        updateProduct = await session.get(
+            Product,
+            id,
+            options=eager_options(Product, ProductRead),
+            populate_existing=True,
+        )
         return api_response(
             200,
             "Product update Successfully",
@@ -67,14 +284,15 @@ def updateOne(
 
 
 @router.delete("/delete/{id}", response_model=dict)
-def deleteOne(id: int, session: GetSession, user: requireSignin):
-    product = session.get(Product, id)
+async def deleteOne(id: int, session: AsyncGetSession, user: requireSignin):
+    product = await session.get(Product, id)
     raiseExceptions((product, 404, "Product not found"))
     print(user.get("id") != product.user_id)
     role = user.get("role")
     if role == "admin" or user.get("id") == product.user_id:
-        session.delete(product)
-        session.commit()
+        await session.delete(product)
+        await session.commit()
+        invalidate("product:list", f"product:{id}")
         return api_response(200, f'Product "{product.title}" deleted successfully')
     else:
         raiseExceptions(
@@ -87,41 +305,77 @@ def deleteOne(id: int, session: GetSession, user: requireSignin):
         )
 
 
-from fastapi import Body
+async def existing_products(session: AsyncSession, ids: list[int]) -> dict:
+    """
+    id -> title of the `ids` that exist. Ids a bulk write skipped are either
+    missing or someone else's; this tells them apart in one query.
+    """
+    if not ids:
+        return {}
+    product = Product.__table__
+    statement = select(product.c.id, product.c.title).where(
+        product.c.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+    )
+    return {row.id: row.title for row in (await session.exec(statement)).all()}
+
+
+def skipped_products(ids: list[int], existing: dict) -> list[dict]:
+    return [
+        (
+            {"id": pid, "title": existing[pid], "reason": "Unauthorized"}
+            if pid in existing
+            else {"id": pid, "reason": "not found"}
+        )
+        for pid in ids
+    ]
+
+
+def delete_products_statement(ids: list[int], user_id: int, is_admin: bool):
+    """
+    DELETE the caller's products among `ids` (any product for admins) and
+    their ratings in one statement, RETURNING id, title of deleted rows.
+    """
+    product, rating = Product.__table__, Rating.__table__
+    ids = bindparam("ids", ids, type_=ARRAY(Integer))
+    targets = and_(
+        product.c.id == any_(ids),
+        or_(product.c.user_id == user_id, literal(is_admin)),
+    )
+    ratings = sql_delete(rating).where(
+        rating.c.product_id.in_(select(product.c.id).where(targets))
+    )
+    return (
+        sql_delete(product)
+        .where(targets)
+        .returning(product.c.id, product.c.title)
+        .add_cte(ratings.cte("deleted_ratings"))
+    )
 
 
 @router.delete("/delete-many", response_model=dict)
-def delete_many(
-    session: GetSession,
+async def delete_many(
+    session: AsyncGetSession,
     user: requireSignin,
     product_ids: list[int] = Body(
         ..., embed=True, description="List of product IDs to delete"
     ),
 ):
-    deleted = []
-    failed = []
-
-    role = user.get("role")
-    user_id = user.get("id")
-
-    for pid in product_ids:
-        instance = session.get(Product, pid)
-        if not instance:
-            failed.append({"id": pid, "reason": "not found"})
-            continue
+    ids = list(dict.fromkeys(product_ids))
+    is_admin = user.get("role") == "admin"
 
-        # Permission check
-        if role == "admin" or user_id == instance.user_id:
-            session.delete(instance)
-            deleted.append({"id": pid, "title": instance.title})
-        else:
-            failed.append(
-                {"id": pid, "title": instance.title, "reason": "Unauthorized"}
-            )
+    rows = (
+        await session.exec(delete_products_statement(ids, user.get("id"), is_admin))
+    ).all()
+    titles = {row.id: row.title for row in rows}
+    missing = [pid for pid in ids if pid not in titles]
+    others = await existing_products(session, missing)
 
     # Commit all successful deletes at once
-    session.commit()
+    await session.commit()
+    invalidate("product:list", *[f"product:{pid}" for pid in titles])
 
+    deleted = [{"id": pid, "title": titles[pid]} for pid in ids if pid in titles]
+    failed = skipped_products(missing, others)
     return api_response(
         200,
         "Bulk delete processed",
@@ -137,15 +391,188 @@ def delete_many(
     )
 
 
+def update_products_statement(
+    rows: list[ProductBulkUpdate],
+    fields: tuple[str, ...],
+    user_id: int,
+    is_admin: bool,
+):
+    """
+    UPDATE product SET <fields>, updated_at = now() FROM (VALUES ...) AS v
+    WHERE product.id = v.id AND (user_id = :uid OR :is_admin) RETURNING id
+    """
+    product = Product.__table__
+    data = sql_values(
+        column("id", Integer),
+        *[column(field, product.c[field].type) for field in fields],
+        name="v",
+    ).data([(row.id, *[getattr(row, field) for field in fields]) for row in rows])
+    # cast: a column that is NULL in every row would otherwise be typed text
+    changes = {field: cast(data.c[field], product.c[field].type) for field in fields}
+    return (
+        sql_update(product)
+        .where(
+            product.c.id == data.c.id,
+            or_(product.c.user_id == user_id, literal(is_admin)),
+        )
+        .values({**changes, "updated_at": func.now()})
+        .returning(product.c.id)
+    )
+
+
+async def update_products(
+    session: AsyncSession, groups: dict, user_id: int, is_admin: bool
+) -> tuple[set[int], list[int]]:
+    """
+    One chunk, {fields: [ProductBulkUpdate]} -> (updated ids, ids the database
+    rejected). One UPDATE per field set, committed together; on a database
+    error (e.g. stock out of integer range) the chunk is retried row by row
+    in savepoints so one bad row does not sink the rest.
+    """
+    try:
+        ids = set()
+        for fields, group in groups.items():
+            statement = update_products_statement(group, fields, user_id, is_admin)
+            ids.update((await session.exec(statement)).scalars().all())
+        await session.commit()
+        return ids, []
+    except (IntegrityError, DataError):
+        await session.rollback()
+
+    ids, rejected = set(), []
+    for fields, group in groups.items():
+        for row in group:
+            statement = update_products_statement([row], fields, user_id, is_admin)
+            try:
+                async with session.begin_nested():
+                    ids.update((await session.exec(statement)).scalars().all())
+            except (IntegrityError, DataError):
+                rejected.append(row.id)
+    await session.commit()
+    return ids, rejected
+
+
+@router.put(
+    "/update-many",
+    response_model=dict,
+    openapi_extra={"requestBody": UPDATE_MANY_BODY},
+)
+async def update_many(
+    request: Request, session: AsyncGetSession, user: requireSignin
+):
+    """
+    JSON array or NDJSON of {id, price?, sale_price?, stock?, is_active?}.
+    Each BULK_CHUNK_SIZE chunk is one UPDATE ... FROM (VALUES ...) per set of
+    fields sent (usually one) in its own transaction.
+    """
+    is_admin = user.get("role") == "admin"
+    updated, failed, requested = [], [], 0
+    async for chunk in chunked(request_items(request), BULK_CHUNK_SIZE):
+        requested += len(chunk)
+        rows, invalid = validate_items(ProductBulkUpdate, chunk)
+        failed.extend(invalid)
+
+        # same id twice in a chunk: the last row wins, earlier ones are reported
+        latest = {}
+        for index, row in rows:
+            if row.id in latest:
+                failed.append(
+                    {
+                        "index": latest[row.id][0],
+                        "id": row.id,
+                        "reason": "superseded",
+                        "superseded_by": index,
+                    }
+                )
+            latest[row.id] = (index, row)
+        groups: dict[tuple, list] = {}
+        for index, row in latest.values():
+            fields = tuple(sorted(row.model_fields_set - {"id"}))
+            if not fields:
+                failed.append(
+                    {"index": index, "id": row.id, "reason": "nothing to update"}
+                )
+                continue
+            groups.setdefault(fields, []).append(row)
+        if not groups:
+            continue
+
+        ids, rejected = await update_products(
+            session, groups, user.get("id"), is_admin
+        )
+        for pid in rejected:
+            failed.append(
+                {
+                    "index": latest[pid][0],
+                    "id": pid,
+                    "reason": "rejected by the database",
+                }
+            )
+
+        sent = [row.id for rows in groups.values() for row in rows]
+        missing = [pid for pid in sent if pid not in ids and pid not in rejected]
+        existing = await existing_products(session, missing)
+        for item in skipped_products(missing, existing):
+            failed.append({"index": latest[item["id"]][0], **item})
+        updated.extend(pid for pid in sent if pid in ids)
+
+    if updated:
+        invalidate("product:list", *[f"product:{pid}" for pid in updated])
+    failed.sort(key=lambda item: item["index"])
+    return api_response(
+        200,
+        "Bulk update processed",
+        {
+            "updated": updated,
+            "failed": failed,
+            "summary": {
+                "requested": requested,
+                "updated_count": len(updated),
+                "failed_count": len(failed),
+            },
+        },
+    )
+
+
 @router.get("/list", response_model=list[ProductRead])
-def list(
+async def list(
+    query_params: ListQueryParams,
+    session: AsyncGetSession,
+    if_none_match: IfNoneMatch = None,
+):
+    query_params = vars(query_params)
+    searchFields = ["title", "description", "category.title"]
+    etag = await listPageETagAsync(
+        session, Product, query_params, searchFields, ProductRead
+    )
+    if response := notModified(etag, if_none_match, PUBLIC_CACHE):
+        return response
+
+    response = await cachedResponse(
+        cache_key("product:list", {**query_params, "etag": etag}),
+        product_tags(),
+        lambda: listRecordsAsync(
+            query_params=query_params,
+            searchFields=searchFields,
+            Model=Product,
+            Schema=ProductRead,
+        ),
+    )
+    return withETag(response, etag, PUBLIC_CACHE)
+
+
+@router.get("/export")
+async def export(
     query_params: ListQueryParams,
+    format: str = Query("ndjson", description="'ndjson' or 'csv'"),
+    auth=requirePermission("product"),
 ):
     query_params = vars(query_params)
     searchFields = ["title", "description", "category.title"]
-    return listRecords(
+    return await exportRecordsAsync(
         query_params=query_params,
         searchFields=searchFields,
         Model=Product,
         Schema=ProductRead,
+        format=format,
     )
@@ -1,139 +1,181 @@
-from statistics import mean
 from fastapi import APIRouter
+from sqlalchemy import func, update as sql_update
+from sqlmodel import select
 
-from src.api.core.operation import listop, updateOp
+from src.api.core.operation import listParams, listopAsync, updateOp
+from src.api.core.operation.projection_helper import project_rows
 from src.api.core.decorator import handle_async_wrapper
-from src.api.core.dependencies import GetSession, ListQueryParams, requireSignin
+from src.api.core.cache import invalidate
+from src.api.core.dependencies import AsyncGetSession, ListQueryParams, requireSignin
 from src.api.core.response import api_response, raiseExceptions
 
-from src.api.models.productModel import Product
+from src.api.models.productModel import Product, rating_histogram
 from src.api.models.ratingModel import (
     ProductAllRating,
     ProductRatingRead,
     Rating,
     RatingCreate,
+    RatingRead,
     RatingUpdate,
 )
 
 
 router = APIRouter(prefix="/product/rating", tags=["Rating"])
 
+RATING_COLUMNS = (
+    Product.id,
+    Product.avg_rating,
+    Product.rating_count,
+    *[getattr(Product, f"rating_{score}") for score in range(1, 6)],
+)
+
+
+def rating_delta(product_id: int, add: int = None, remove: int = None):
+    """
+    Apply one rating change to the product's aggregates in SQL
+    (count/sum/histogram = column +/- n), so concurrent writers never
+    overwrite each other, and bump updated_at (list/read ETags). RETURNING
+    the new aggregates; with no change (add == remove) it only SELECTs them.
+    """
+    if add == remove:
+        return select(*RATING_COLUMNS).where(Product.id == product_id)
+
+    product = Product.__table__
+    values = {}
+    for score, step in ((add, 1), (remove, -1)):
+        if score is None:
+            continue
+        values[f"rating_{score}"] = product.c[f"rating_{score}"] + step
+    count_step = (add is not None) - (remove is not None)
+    if count_step:
+        values["rating_count"] = product.c.rating_count + count_step
+    values["rating_sum"] = product.c.rating_sum + (add or 0) - (remove or 0)
+    values["updated_at"] = func.now()
+    return (
+        sql_update(product)
+        .where(product.c.id == product_id)
+        .values(values)
+        .returning(*[product.c[column.key] for column in RATING_COLUMNS])
+    )
+
+
+def rating_summary(row) -> ProductRatingRead:
+    return ProductRatingRead(
+        product_id=row.id,
+        avg_rating=row.avg_rating or 0.0,
+        rating_count=row.rating_count,
+        histogram=rating_histogram(row),
+    )
+
 
 @router.post("/create/{product_id}")
 @handle_async_wrapper
-def create(
-    product_id: int, request: RatingCreate, session: GetSession, user: requireSignin
+async def create(
+    product_id: int,
+    request: RatingCreate,
+    session: AsyncGetSession,
+    user: requireSignin,
 ):
 
     data = Rating(**request.model_dump())
     data.product_id = product_id
     data.user_id = user.get("id")
     session.add(data)
-    session.commit()
-    session.refresh(data)
-    product = session.get(Product, product_id)
+    await session.flush()
+    # same transaction as the insert
+    product = (await session.exec(rating_delta(product_id, add=data.score))).first()
     raiseExceptions((product, 404, "Product not found"))
-    avg = 0.0
-    if product.ratings:
-        avg = float(mean([r.score for r in product.ratings]))
+    await session.commit()
+    invalidate("product:list", f"product:{product_id}")
 
-    return api_response(
-        200,
-        "Rating added Successfully",
-        ProductRatingRead(product_id=product.id, avg_rating=avg),
-    )
+    return api_response(200, "Rating added Successfully", rating_summary(product))
 
 
 @router.put("/update/{id}", response_model=ProductRatingRead)
 @handle_async_wrapper
-def update(id: int, request: RatingUpdate, session: GetSession, user: requireSignin):
+async def update(
+    id: int, request: RatingUpdate, session: AsyncGetSession, user: requireSignin
+):
 
-    rating = session.get(Rating, id)  # Like findById
+    # row lock: the old score read here is the one the delta removes
+    rating = await session.get(Rating, id, with_for_update=True)  # Like findById
     raiseExceptions((rating, 404, "Rating not found"))
     if rating.user_id != user.get("id") and user.get("role") != "admin":
         api_response(400, "You are not authorized to update this rating")
 
+    old_score = rating.score
     updateOp(rating, request, session)
-
-    session.commit()
-    session.refresh(rating)
-    product = session.get(Product, rating.product_id)
-    raiseExceptions((product, 404, "Product not found"))
-    avg = 0.0
-    if product.ratings:
-        avg = (
-            float(mean([r.score for r in product.ratings])) if product.ratings else 0.0
+    await session.flush()
+    product = (
+        await session.exec(
+            rating_delta(rating.product_id, add=rating.score, remove=old_score)
         )
-    return api_response(
-        200,
-        "Rating Update Successfully",
-        ProductRatingRead(product_id=product.id, avg_rating=avg),
-    )
+    ).first()
+    raiseExceptions((product, 404, "Product not found"))
+
+    await session.commit()
+    invalidate("product:list", f"product:{rating.product_id}")
+    return api_response(200, "Rating Update Successfully", rating_summary(product))
 
 
 @router.delete("/delete/{id}", response_model=ProductRatingRead)
 @handle_async_wrapper
-def delete(id: int, session: GetSession, user: requireSignin):
+async def delete(id: int, session: AsyncGetSession, user: requireSignin):
 
-    rating = session.get(Rating, id)  # Like findById
+    rating = await session.get(Rating, id, with_for_update=True)  # Like findById
     raiseExceptions((rating, 404, "Rating not found"))
     if rating.user_id != user.get("id") and user.get("role") != "admin":
         api_response(400, "You are not authorized to update this rating")
 
-    session.delete(rating)
-    session.commit()
+    await session.delete(rating)
+    await session.flush()
+    await session.exec(rating_delta(rating.product_id, remove=rating.score))
+    await session.commit()
+    invalidate("product:list", f"product:{rating.product_id}")
 
     return api_response(200, "Rating Delete Successfully")
 
 
 @router.get("/read/{product_id}")
 @handle_async_wrapper
-def get_role(
+async def get_role(
     product_id: int,
-    session: GetSession,
+    session: AsyncGetSession,
     query_params: ListQueryParams,
     user=requireSignin,
 ):
     searchFields = ["comment"]
 
-    product = session.get(Product, product_id)  # Like findById
+    # product row carries the SQL-maintained aggregates (no AVG over ratings)
+    product = (await session.exec(rating_delta(product_id))).first()
     raiseExceptions((product, 404, "Product not found"))
 
-    query_params = vars(query_params)
-    dateRange = query_params.get("dateRange")
-    searchTerm = query_params.get("searchTerm")
-    columnFilters = query_params.get("columnFilters")
-    numberRange = query_params.get("numberRange")
-    page = int(query_params.get("page", 1))
-    skip = int(query_params.get("skip", 0))
-    limit = int(query_params.get("limit", 10))
-    filters = {
-        "searchTerm": searchTerm,
-        "columnFilters": columnFilters,
-        "dateRange": dateRange,
-        "numberRange": numberRange,
-        "customFilters": [["id", product_id]],
-    }
-
-    result = listop(
-        session=session,
-        Model=Product,
-        searchFields=searchFields,
-        filters=filters,
-        skip=skip,
-        page=page,
-        limit=limit,
+    # Page over this product's ratings: sort=score / -created_at, cursors...
+    params = listParams(vars(query_params), RatingRead)
+    params["filters"]["customFilters"] = [["product_id", product_id]]
+    result = await listopAsync(
+        session, Model=Rating, searchFields=searchFields, **params
     )
 
-    list_data = [ProductAllRating.model_validate(prod) for prod in result["data"]]
-    product = list_data[0]
-    avg = 0.0
-    if product.ratings:
-        avg = float(mean([r.score for r in product.ratings]))
-    product.avg_rating = avg
+    if params["fields"]:
+        ratings = project_rows(result["data"], params["fields"])
+    else:
+        ratings = [RatingRead.model_validate(r) for r in result["data"]]
+    summary = rating_summary(product)
+    data = ProductAllRating(
+        id=product_id,
+        avg_rating=summary.avg_rating,
+        rating_count=summary.rating_count,
+        histogram=summary.histogram,
+    )
+    if params["fields"]:
+        data = {**data.model_dump(exclude={"ratings"}), "ratings": ratings}
+    else:
+        data.ratings = ratings
     return api_response(
         200,
         "data found",
-        product,
+        data,
         result["total"],
+        next_cursor=result.get("next_cursor"),
     )
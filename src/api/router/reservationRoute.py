@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+
+from fastapi import APIRouter
+from sqlalchemy import update as sql_update
+from sqlalchemy.orm import selectinload
+
+from src.api.core.dependencies import AsyncGetSession, requireSignin
+from src.api.core.cache import invalidate
+from src.api.core.response import api_response, raiseExceptions
+from src.api.core.stock import expired_statement, release, release_statement, reserve
+from src.api.models.reservationModel import (
+    Reservation,
+    ReservationCreate,
+    ReservationRead,
+)
+
+router = APIRouter(prefix="/reservation", tags=["Reservation"])
+
+
+def stock_changed(product_ids: list[int]):
+    """Stock is part of product responses: drop their cached bodies."""
+    if product_ids:
+        invalidate("product:list", *[f"product:{id}" for id in product_ids])
+
+
+async def owned_reservation(session, id: int, user: dict) -> Reservation:
+    reservation = await session.get(
+        Reservation, id, options=[selectinload(Reservation.items)]
+    )
+    raiseExceptions(
+        (
+            reservation
+            and (user.get("role") == "admin" or reservation.user_id == user.get("id")),
+            404,
+            "Reservation not found",
+        )
+    )
+    return reservation
+
+
+@router.post("/create", response_model=ReservationRead)
+async def create(
+    request: ReservationCreate, session: AsyncGetSession, user: requireSignin
+):
+    """
+    Hold stock for a basket until checkout or RESERVATION_TTL_MINUTES; all
+    items or none (409 names the products short on stock).
+    """
+    # give back expired holds on this basket's products, they may be what it
+    # needs; the rest are left to the release_reservations cron job
+    basket = {item.product_id for item in request.items}
+    _, restocked = await release(session, expired_statement(basket))
+    await session.commit()
+    stock_changed(restocked)
+
+    reservation = await reserve(session, user.get("id"), request.items)
+    await session.commit()
+    stock_changed([item.product_id for item in reservation.items])
+    return api_response(
+        200, "Stock reserved", ReservationRead.model_validate(reservation)
+    )
+
+
+@router.get("/read/{id}", response_model=ReservationRead)
+async def findOne(id: int, session: AsyncGetSession, user: requireSignin):
+    reservation = await owned_reservation(session, id, user)
+    return api_response(
+        200, "Reservation Found", ReservationRead.model_validate(reservation)
+    )
+
+
+@router.post("/checkout/{id}", response_model=ReservationRead)
+async def checkout(id: int, session: AsyncGetSession, user: requireSignin):
+    """Turn a live hold into a sale; the stock was already taken at reserve."""
+    reservation = await owned_reservation(session, id, user)
+    table = Reservation.__table__
+    now = datetime.now(timezone.utc)
+    # conditional: a hold that expired or was released meanwhile stays as is
+    statement = (
+        sql_update(table)
+        .where(table.c.id == id, table.c.status == "held", table.c.expires_at > now)
+        .values(status="checked_out", updated_at=now)
+        .returning(table.c.id)
+    )
+    checked_out = (await session.exec(statement)).first()
+    if checked_out is None:
+        _, restocked = await release(
+            session, release_statement("expired", table.c.id == id)
+        )
+        await session.commit()
+        stock_changed(restocked)
+        await session.refresh(reservation, ["status", "updated_at"])
+        api_response(409, f"Reservation is {reservation.status}")
+
+    await session.commit()
+    await session.refresh(reservation, ["status", "updated_at"])
+    return api_response(
+        200, "Checkout complete", ReservationRead.model_validate(reservation)
+    )
+
+
+@router.post("/release/{id}", response_model=ReservationRead)
+async def release_one(id: int, session: AsyncGetSession, user: requireSignin):
+    """Cancel a hold and put its items back on stock."""
+    reservation = await owned_reservation(session, id, user)
+    table = Reservation.__table__
+    released, restocked = await release(
+        session, release_statement("released", table.c.id == id)
+    )
+    await session.commit()
+    stock_changed(restocked)
+    await session.refresh(reservation, ["status", "updated_at"])
+    raiseExceptions(
+        (released, 409, f"Reservation is {reservation.status}"),
+    )
+    return api_response(
+        200, "Reservation released", ReservationRead.model_validate(reservation)
+    )
@@ -1,8 +1,21 @@
-from fastapi import APIRouter, Request
-from src.api.core.operation import listRecords, updateOp
+from fastapi import APIRouter, Query, Request
+from src.api.core.operation import exportRecords, listRecords, updateOp
 from src.api.core.response import api_response, raiseExceptions
+from src.api.core.permission_registry import permission_registry
 from src.api.models.roleModel import Role, RoleCreate, RoleRead, RoleUpdate
-from src.api.core.dependencies import GetSession, ListQueryParams, requirePermission
+from src.api.core.dependencies import (
+    GetSession,
+    IfNoneMatch,
+    ListQueryParams,
+    requirePermission,
+)
+from src.api.core.conditional import (
+    listVersionStatements,
+    notModified,
+    recordVersionStatements,
+    versionETag,
+    withETag,
+)
 
 
 router = APIRouter(prefix="/role", tags=["Role"])
@@ -16,6 +29,7 @@ def create_role(
     session.add(role)
     session.commit()
     session.refresh(role)
+    permission_registry.upsert(role)
     return api_response(200, "Role Created Successfully", role)
 
 
@@ -30,9 +44,12 @@ def update_role(
     role = session.get(Role, id)  # Like findById
     raiseExceptions((role, 404, "Role not found"))
     updateOp(role, request, session)
+    # signed-in users of this role pick up the change on their next request
+    role.version = Role.version + 1
 
     session.commit()
     session.refresh(role)
+    permission_registry.upsert(role)
     return api_response(200, "Role Update Successfully", role)
 
 
@@ -40,13 +57,17 @@ def update_role(
 def get_role(
     id: int,
     session: GetSession,
+    if_none_match: IfNoneMatch = None,
     user=requirePermission("role"),
 ):
+    etag = versionETag(session, recordVersionStatements(Role, id, RoleRead))
+    if response := notModified(etag, if_none_match):
+        return response
 
     role = session.get(Role, id)  # Like findById
     raiseExceptions((role, 404, "Role not found"))
 
-    return api_response(200, "Role Found", role)
+    return withETag(api_response(200, "Role Found", role), etag)
 
 
 # ❗ DELETE
@@ -61,6 +82,7 @@ def delete_role(
 
     session.delete(role)
     session.commit()
+    permission_registry.remove(id)
     return api_response(404, f"Role {role.title} deleted")
 
 
@@ -68,15 +90,45 @@ def delete_role(
 @router.get("/list", response_model=list[RoleRead])
 def list(
     query_params: ListQueryParams,
+    session: GetSession,
+    if_none_match: IfNoneMatch = None,
+    user=requirePermission("role"),
+):
+    query_params = vars(query_params)
+    searchFields = [
+        "title",
+    ]
+    etag = versionETag(
+        session,
+        listVersionStatements(Role, query_params, searchFields, RoleRead),
+        query_params,
+    )
+    if response := notModified(etag, if_none_match):
+        return response
+
+    response = listRecords(
+        query_params=query_params,
+        searchFields=searchFields,
+        Model=Role,
+        Schema=RoleRead,
+    )
+    return withETag(response, etag)
+
+
+@router.get("/export")
+def export(
+    query_params: ListQueryParams,
+    format: str = Query("ndjson", description="'ndjson' or 'csv'"),
     user=requirePermission("role"),
 ):
     query_params = vars(query_params)
     searchFields = [
         "title",
     ]
-    return listRecords(
+    return exportRecords(
         query_params=query_params,
         searchFields=searchFields,
         Model=Role,
         Schema=RoleRead,
+        format=format,
     )
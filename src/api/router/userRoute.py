@@ -8,10 +8,16 @@ from fastapi import (
 from sqlalchemy import select
 
 from src.api.core.dependencies import ListQueryParams
-from src.api.core.security import hash_password
-from src.api.core import listRecords, updateOp, requireSignin
-from src.api.core.dependencies import GetSession, requirePermission, requireAdmin
+from src.api.core.security import hash_password_async
+from src.api.core import exportRecords, listRecords, updateOp, requireSignin
+from src.api.core.dependencies import (
+    AsyncGetSession,
+    GetSession,
+    requirePermission,
+    requireAdmin,
+)
 from src.api.core.response import api_response, raiseExceptions
+from src.api.core.cache import invalidate
 from src.api.models.userModel import UpdateUserByAdmin, User, UserRead, UserUpdate
 
 
@@ -19,38 +25,42 @@ router = APIRouter(prefix="/user", tags=["user"])
 
 
 @router.put("/update", response_model=UserRead)
-def update_user(
+async def update_user(
     user: requireSignin,
     request: UserUpdate,
-    session: GetSession,
+    session: AsyncGetSession,
 ):
     user_id = user.get("id")
-    db_user = session.get(User, user_id)  # Like findById
+    db_user = await session.get(User, user_id)  # Like findById
     raiseExceptions((db_user, 404, "User not found"))
     update_user = updateOp(db_user, request, session)
     if request.password:
-        hashed_password = hash_password(request.password)
+        hashed_password = await hash_password_async(request.password)
         update_user.password = hashed_password
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    # product responses embed the owner
+    invalidate("user")
+    await session.refresh(db_user)
     return api_response(200, "User Found", UserRead.model_validate(db_user))
 
 
 @router.put("/updatebyadmin/{user_id}", response_model=UserRead)
-def update_user(
+async def update_user(
     user_id: int,
     request: UpdateUserByAdmin,
-    session: GetSession,
+    session: AsyncGetSession,
     user=requirePermission("all"),
 ):
-    db_user = session.get(User, user_id)  # Like findById
+    db_user = await session.get(User, user_id)  # Like findById
     raiseExceptions((db_user, 404, "User not found"))
     update_user = updateOp(db_user, request, session)
     if request.password:
-        hashed_password = hash_password(request.password)
+        hashed_password = await hash_password_async(request.password)
         update_user.password = hashed_password
-    session.commit()
-    session.refresh(update_user)
+    await session.commit()
+    # product responses embed the owner
+    invalidate("user")
+    await session.refresh(update_user)
     return api_response(200, "User Found", UserRead.model_validate(update_user))
 
 
@@ -77,6 +87,28 @@ def list_users(
     )
 
 
+@router.get("/export")
+def export_users(
+    user: requireAdmin,
+    query_params: ListQueryParams,
+    format: str = Query("ndjson", description="'ndjson' or 'csv'"),
+):
+    query_params = vars(query_params)
+    searchFields = [
+        "full_name",
+        "email",
+        "phone",
+        "role.title",
+    ]
+    return exportRecords(
+        query_params=query_params,
+        searchFields=searchFields,
+        Model=User,
+        Schema=UserRead,
+        format=format,
+    )
+
+
 @router.get("/read", response_model=User)
 def get_user(
     user: requireSignin,
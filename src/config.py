@@ -5,6 +5,14 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Driver model behind the async routes: "async" awaits the async engine,
+# "sync" runs every query on the psycopg2 engine in the threadpool (A/B
+# throughput comparisons under the same load)
+DB_MODE = os.getenv("DB_MODE", "async")
+# Async routers: driver for the async engine ("asyncpg" or "psycopg" for psycopg 3);
+# ASYNC_DATABASE_URL overrides the URL derived from DATABASE_URL entirely
+ASYNC_DB_DRIVER = os.getenv("ASYNC_DB_DRIVER", "asyncpg")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
 SECRET_KEY = os.getenv("SECRET_KEY")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(
     os.getenv(
@@ -12,3 +20,58 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(
         30,
     )
 )
+
+# List endpoints: default cap used by countMode="capped"
+LIST_COUNT_CAP = int(os.getenv("LIST_COUNT_CAP", 10000))
+
+# Test mode: fail list endpoints issuing more queries than this (0 = off)
+LIST_QUERY_BUDGET = int(os.getenv("LIST_QUERY_BUDGET", 0))
+
+# Export endpoints: rows fetched per server-side cursor round-trip
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+# Response cache for list/read endpoints: entry lifetime in seconds and total
+# size of cached bodies in bytes (either set to 0 disables the cache)
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 30))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Cache-Control max-age (seconds) for public catalog lists; authenticated
+# reads are always revalidated through their ETag
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", 60))
+
+# Category tree index: seconds before a worker reloads it from the database
+# (its own writes patch it immediately)
+CATEGORY_TREE_TTL = float(os.getenv("CATEGORY_TREE_TTL", 300))
+
+# /category/delete-parent default for products in the deleted subtree:
+# "restrict" (refuse), "cascade" (delete them) or "reparent" (move them up)
+CATEGORY_DELETE_PRODUCTS = os.getenv("CATEGORY_DELETE_PRODUCTS", "restrict")
+
+# Decoded access tokens kept per worker so repeat requests skip HS256
+# verification; entries live until the token's exp (0 disables)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+
+# Password hashing: scheme for new hashes ("bcrypt" or "argon2") and its cost.
+# Hashes made with the other scheme or older parameters still verify and are
+# re-hashed on the user's next login
+PASSWORD_SCHEME = os.getenv("PASSWORD_SCHEME", "bcrypt")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 64 * 1024))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 4))
+
+# Password hashing pool (separate from the request thread pool): hashes run
+# at once, and how many more may wait before new requests get 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 64))
+
+# Role permission registry: seconds before a worker reloads roles from the
+# database (tokens carrying a newer role version reload it right away)
+ROLE_REGISTRY_TTL = float(os.getenv("ROLE_REGISTRY_TTL", 60))
+
+# Bulk product endpoints: rows per multi-row statement, each chunk in its
+# own transaction
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 1000))
+
+# Checkout: minutes a stock reservation is held before the stock returns
+RESERVATION_TTL_MINUTES = int(os.getenv("RESERVATION_TTL_MINUTES", 15))
@@ -1,10 +1,14 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import (
     Session,
     create_engine,
 )
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.config import DATABASE_URL
+from src.config import ASYNC_DATABASE_URL, ASYNC_DB_DRIVER, DATABASE_URL, DB_MODE
 
 
 engine = create_engine(
@@ -15,9 +19,140 @@ engine = create_engine(
 )
 
 
+def async_database_url():
+    if ASYNC_DATABASE_URL:
+        return ASYNC_DATABASE_URL
+    # postgresql:// or postgresql+psycopg2:// -> postgresql+asyncpg://
+    return make_url(DATABASE_URL).set(drivername=f"postgresql+{ASYNC_DB_DRIVER}")
+
+
+# Same database, async driver: requests wait on I/O without holding a thread
+async_engine = create_async_engine(
+    async_database_url(),
+    echo=True,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
+
+
 def get_session():
     session = Session(engine)
     try:
         yield session
     finally:
         session.close()
+
+
+class ThreadedSession:
+    """
+    The AsyncSession calls the async routes make, served by a sync Session
+    on the psycopg2 engine: each call blocks a threadpool thread instead of
+    awaiting the async driver (DB_MODE=sync, for A/B load tests).
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    async def _call(self, method: str, *args, **kwargs):
+        return await run_in_threadpool(
+            getattr(self.sync_session, method), *args, **kwargs
+        )
+
+    async def exec(self, *args, **kwargs):
+        return await self._call("exec", *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await self._call("get", *args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        return await self._call("refresh", *args, **kwargs)
+
+    async def delete(self, instance):
+        return await self._call("delete", instance)
+
+    async def flush(self):
+        return await self._call("flush")
+
+    async def commit(self):
+        return await self._call("commit")
+
+    async def rollback(self):
+        return await self._call("rollback")
+
+    async def close(self):
+        return await self._call("close")
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        transaction = await self._call("begin_nested")
+        try:
+            yield transaction
+        except BaseException:
+            await run_in_threadpool(transaction.rollback)
+            raise
+        await run_in_threadpool(transaction.commit)
+
+
+def async_session():
+    """
+    Session for the async routes: AsyncSession on async_engine, or with
+    DB_MODE=sync a ThreadedSession on the sync engine.
+    """
+    # expire_on_commit=False: attribute access after commit must not hit the DB
+    if DB_MODE == "sync":
+        return _threaded_session()
+    return AsyncSession(async_engine, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def _threaded_session():
+    session = ThreadedSession(Session(engine, expire_on_commit=False))
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_async_session():
+    async with async_session() as session:
+        yield session
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A block sent more SQL statements than its query_budget allows."""
+
+
+@contextmanager
+def query_budget(session: Session, budget: int, label: str = "block"):
+    """
+    Count SQL statements sent on this session's connection and raise
+    QueryBudgetExceeded when the block issues more than `budget` (test mode
+    guard against N+1 queries).
+    """
+    if not budget:
+        yield
+        return
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = session.connection()
+    event.listen(connection, "before_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", count)
+
+    if len(statements) > budget:
+        raise QueryBudgetExceeded(
+            f"{label} issued {len(statements)} queries (budget {budget}):\n"
+            + "\n".join(statements)
+        )
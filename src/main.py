@@ -1,6 +1,11 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
+from src.api.core.cache import response_cache
+from src.api.core.dependencies import requireAdmin
+from src.api.core.password import hash_pool
+from src.api.core.response import api_response
+
 from src.api.router import (
     authRoute,
     userRoute,
@@ -8,6 +13,7 @@ from src.api.router import (
     categoryRoute,
     productRoute,
     ratingRoute,
+    reservationRoute,
 )
 
 
@@ -16,6 +22,7 @@ from src.api.router import (
 async def lifespan(app: FastAPI):
     yield  # 👈 After this, FastAPI starts handling requests
     # Optionally: add cleanup tasks here (closing connections, etc.)
+    hash_pool.shutdown()
 
 
 # Initialize the FastAPI app with the custom lifespan
@@ -27,9 +34,22 @@ def root():
     return {"message": "Hello, FastAPI with uv!"}
 
 
+@app.get("/cache/stats")
+def cache_stats(user: requireAdmin):
+    # hit/miss/eviction counters of this worker's response cache
+    return api_response(200, "Cache stats", response_cache.stats())
+
+
+@app.get("/password/stats")
+def password_stats(user: requireAdmin):
+    # password hashing pool: queue length, queue time and hash time
+    return api_response(200, "Password hashing stats", hash_pool.stats())
+
+
 app.include_router(authRoute.router)
 app.include_router(userRoute.router)
 app.include_router(roleRoute.router)
 app.include_router(categoryRoute.router)
 app.include_router(productRoute.router)
 app.include_router(ratingRoute.router)
+app.include_router(reservationRoute.router)
@@ -0,0 +1,331 @@
+"""
+Load the ctspk.sql MySQL dump (a real shop) into our schema, for profiling
+the list/search endpoints against realistic data.
+
+    python -m src.scripts.import_ctspk                       # ./ctspk.sql
+    python -m src.scripts.import_ctspk --path dump.sql --truncate
+    python -m src.scripts.import_ctspk --dry-run             # parse + map only
+
+The dump is streamed twice: the first pass keeps only the small lookups
+(categories, permissions, shops, user ids), the second writes rows to
+per-table CSV spools that are bulk-loaded with COPY in one transaction.
+Ids are kept, so run it against a scratch database (--truncate empties
+user_role, user, category, product and rating first, CASCADE).
+
+    permissions   -> user_role (spatie roles; the dump's `roles` is empty)
+    users         -> user      (role from model_has_permissions)
+    categories    -> category  (parent -> parent_id)
+    products      -> product   (deepest category from category_product,
+                                owner of the shop as user_id)
+    reviews       -> rating
+"""
+
+import argparse
+import csv
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+import json
+import tempfile
+from typing import Optional
+
+from sqlmodel import Session
+
+from src.lib.db_con import engine
+from src.api.models.categoryModel import Category
+from src.api.models.productModel import Product
+from src.api.models.ratingModel import Rating
+from src.api.models.roleModel import Role
+from src.api.models.userModel import User
+from src.scripts.mysql_dump import dump_rows
+from src.scripts.reconcile_ratings import reconcile
+
+# dump permission -> (our role title, permissions); first match wins for a user
+ROLES = {
+    "super_admin": ("admin", ["all"]),
+    "store_owner": ("store_owner", ["product", "category"]),
+    "staff": ("staff", ["product", "category"]),
+    "fullfilment": ("fulfilment", ["product"]),
+    "customer": ("user", ["user"]),
+}
+ROLE_PRIORITY = list(ROLES)
+
+# Columns written per table, in COPY order (parents before children)
+COLUMNS = {
+    Role: ["id", "title", "permissions", "version", "created_at", "updated_at"],
+    User: [
+        "id", "full_name", "email", "password", "phone", "is_active",
+        "role_id", "created_at", "updated_at",
+    ],
+    Category: ["id", "title", "description", "parent_id", "created_at", "updated_at"],
+    Product: [
+        "id", "user_id", "category_id", "title", "description", "images",
+        "price", "sale_price", "stock", "is_active", "created_at", "updated_at",
+    ],
+    Rating: [
+        "id", "score", "comment", "product_id", "user_id", "created_at",
+        "updated_at",
+    ],
+}
+LOOKUP_TABLES = [
+    "categories", "category_product", "permissions", "model_has_permissions",
+    "shops", "users",
+]
+ROW_TABLES = ["users", "products", "reviews"]
+
+# CSV spools stay in memory up to this size, then move to a temp file
+SPOOL_BYTES = 8 * 1024 * 1024
+
+
+class Lookups:
+    """Small tables and id maps from the first pass."""
+
+    def __init__(self, now: str):
+        self.now = now
+        self.roles: dict[int, str] = {}  # permission id -> name
+        self.user_roles: dict[int, set[int]] = defaultdict(set)
+        self.users: dict[int, int] = {}  # dump user id -> kept id (email dedupe)
+        self.shop_owners: dict[int, int] = {}
+        self.categories: dict[int, dict] = {}
+        self.product_categories: dict[int, list[int]] = defaultdict(list)
+        self.depth: dict[int, int] = {}
+
+    def collect(self, table: str, row: dict, emails: dict):
+        if table == "permissions":
+            self.roles[row["id"]] = row["name"]
+        elif table == "model_has_permissions" and row["model_type"].endswith("User"):
+            self.user_roles[row["model_id"]].add(row["permission_id"])
+        elif table == "shops":
+            self.shop_owners[row["id"]] = row["owner_id"]
+        elif table == "categories" and row["deleted_at"] is None:
+            self.categories[row["id"]] = row
+        elif table == "category_product":
+            self.product_categories[row["product_id"]].append(row["category_id"])
+        elif table == "users":
+            email = (row["email"] or "").strip().lower()
+            if email and row["password"]:
+                self.users[row["id"]] = emails.setdefault(email, row["id"])
+
+    def finish(self):
+        # parents that were deleted / missing -> root; depth for "deepest"
+        for id, row in self.categories.items():
+            if row["parent"] not in self.categories or row["parent"] == id:
+                row["parent"] = None
+        for id in self.categories:
+            depth, seen, parent = 0, {id}, self.categories[id]["parent"]
+            while parent is not None and parent not in seen:
+                seen.add(parent)
+                depth += 1
+                parent = self.categories[parent]["parent"]
+            self.depth[id] = depth
+
+    def role_id(self, user_id: int) -> Optional[int]:
+        names = {self.roles.get(p) for p in self.user_roles.get(user_id, ())}
+        for name in ROLE_PRIORITY:
+            if name in names:
+                return self.role_ids[name]
+        return self.role_ids.get("customer")
+
+    @property
+    def role_ids(self) -> dict[str, int]:
+        return {name: id for id, name in self.roles.items() if name in ROLES}
+
+    def admin_id(self) -> Optional[int]:
+        admin = self.role_ids.get("super_admin")
+        ids = [
+            kept for id, kept in self.users.items()
+            if id == kept and admin in self.user_roles.get(id, ())
+        ]
+        return min(ids) if ids else None
+
+
+def _timestamps(row: dict, now: str) -> list:
+    return [row.get("created_at") or now, row.get("updated_at")]
+
+
+def _json(value: Optional[str]):
+    try:
+        return json.loads(value) if value else None
+    except ValueError:
+        return None
+
+
+def role_rows(lookups: Lookups):
+    for id, name in sorted(lookups.roles.items()):
+        if name in ROLES:
+            title, permissions = ROLES[name]
+            yield [id, title, json.dumps(permissions), 1, lookups.now, None]
+
+
+def category_rows(lookups: Lookups):
+    titles = Counter(row["name"].strip() for row in lookups.categories.values())
+    for id, row in sorted(lookups.categories.items()):
+        title = row["name"].strip()
+        if titles[title] > 1:  # title is unique here, not in the dump
+            title = f"{title} ({row['slug']})"
+        yield [
+            id, title[:100], row["details"], row["parent"],
+            *_timestamps(row, lookups.now),
+        ]
+
+
+def user_row(row: dict, lookups: Lookups):
+    if lookups.users.get(row["id"]) != row["id"]:
+        return None  # no password / email, or a duplicate email
+    return [
+        row["id"], (row["name"] or row["email"]).strip()[:50],
+        row["email"].strip(), row["password"], None, bool(row["is_active"]),
+        lookups.role_id(row["id"]), *_timestamps(row, lookups.now),
+    ]
+
+
+def product_row(row: dict, lookups: Lookups, admin_id: Optional[int]):
+    if row["deleted_at"] is not None:
+        return None
+    categories = [
+        id for id in lookups.product_categories.get(row["id"], ())
+        if id in lookups.categories
+    ]
+    owner = lookups.users.get(lookups.shop_owners.get(row["shop_id"]), admin_id)
+    if not categories or owner is None:
+        return None
+    category_id = max(categories, key=lambda id: (lookups.depth[id], -id))
+    gallery = _json(row["gallery"])
+    images = [_json(row["image"]), *(gallery if isinstance(gallery, list) else [])]
+    images = [image for image in images if isinstance(image, dict)]
+    return [
+        row["id"], owner, category_id, row["name"].strip()[:100],
+        row["description"], json.dumps(images) if images else None,
+        row["price"] or 0, row["sale_price"] or None, max(row["quantity"], 0),
+        row["status"] == "publish", *_timestamps(row, lookups.now),
+    ]
+
+
+def rating_row(row: dict, lookups: Lookups, products: set, rated: set):
+    user_id = lookups.users.get(row["user_id"])
+    key = (row["product_id"], user_id)
+    if (
+        row["deleted_at"] is not None
+        or row["rating"] is None
+        or row["product_id"] not in products
+        or user_id is None
+        or key in rated
+    ):
+        return None
+    rated.add(key)
+    score = min(max(round(row["rating"]), 1), 5)
+    return [
+        row["id"], score, row["comment"], row["product_id"], user_id,
+        *_timestamps(row, lookups.now),
+    ]
+
+
+def spool_dump(path: str) -> tuple[dict, Counter]:
+    """Both passes -> ({Model: spooled CSV}, counts of loaded/skipped rows)."""
+    lookups = Lookups(datetime.now(timezone.utc).isoformat())
+    emails: dict[str, int] = {}
+    for table, row in dump_rows(path, LOOKUP_TABLES):
+        lookups.collect(table, row, emails)
+    lookups.finish()
+    admin_id = lookups.admin_id()
+
+    spools = {
+        Model: tempfile.SpooledTemporaryFile(
+            SPOOL_BYTES, mode="w+", newline="", encoding="utf-8"
+        )
+        for Model in COLUMNS
+    }
+    # QUOTE_STRINGS: "" is an empty string, an unquoted empty field is NULL
+    writers = {
+        Model: csv.writer(spool, quoting=csv.QUOTE_STRINGS)
+        for Model, spool in spools.items()
+    }
+    counts = Counter()
+
+    def write(Model, rows):
+        for row in rows:
+            counts[Model.__table__.name, "loaded" if row else "skipped"] += 1
+            if row:
+                writers[Model].writerow(row)
+
+    write(Role, role_rows(lookups))
+    write(Category, category_rows(lookups))
+
+    products, rated = set(), set()
+    for table, row in dump_rows(path, ROW_TABLES):
+        if table == "users":
+            write(User, [user_row(row, lookups)])
+        elif table == "products":
+            product = product_row(row, lookups, admin_id)
+            if product:
+                products.add(row["id"])
+            write(Product, [product])
+        else:
+            write(Rating, [rating_row(row, lookups, products, rated)])
+
+    for spool in spools.values():
+        spool.seek(0)
+    return spools, counts
+
+
+def copy_spools(spools: dict, truncate: bool = False):
+    """COPY every spool (FK order) and move the id sequences past the ids."""
+    preparer = engine.dialect.identifier_preparer
+    tables = {Model: preparer.format_table(Model.__table__) for Model in COLUMNS}
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if truncate:
+            cursor.execute(
+                f"TRUNCATE {', '.join(tables.values())} RESTART IDENTITY CASCADE"
+            )
+        for Model, spool in spools.items():
+            columns = ", ".join(preparer.quote(name) for name in COLUMNS[Model])
+            cursor.copy_expert(
+                f"COPY {tables[Model]} ({columns}) FROM STDIN WITH (FORMAT csv)",
+                spool,
+            )
+        for table in tables.values():
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"coalesce(max(id), 1), max(id) IS NOT NULL) FROM {table}"
+            )
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--path", default="ctspk.sql", help="MySQL dump to load")
+    parser.add_argument(
+        "--truncate", action="store_true", help="empty the target tables first"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="parse and map, load nothing"
+    )
+    args = parser.parse_args()
+
+    spools, counts = spool_dump(args.path)
+    try:
+        if not args.dry_run:
+            copy_spools(spools, truncate=args.truncate)
+            with Session(engine) as session:
+                reconcile(session)  # rating aggregates of the loaded products
+    finally:
+        for spool in spools.values():
+            spool.close()
+
+    action = "would load" if args.dry_run else "loaded"
+    for Model in COLUMNS:
+        table = Model.__table__.name
+        print(
+            f"{table}: {action} {counts[table, 'loaded']}, "
+            f"skipped {counts[table, 'skipped']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
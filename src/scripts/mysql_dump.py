@@ -0,0 +1,106 @@
+"""
+Streaming reader for the INSERT INTO statements of a MySQL / phpMyAdmin
+dump: rows come out one at a time while the file is read line by line,
+so the dump is never held in memory.
+"""
+
+import re
+from typing import Iterable, Iterator, Optional
+
+HEADER = re.compile(r"INSERT INTO `(\w+)` \(([^)]*)\) VALUES\s*(.*)", re.S)
+TOKEN = re.compile(
+    r"""\s*(?:
+        '((?:[^'\\]|\\.|'')*)'   # 1: quoted string
+      | (NULL)\b                 # 2
+      | ([-+]?[0-9][0-9.eE+-]*)  # 3: number
+      | ([(),;])                 # 4: punctuation
+    )""",
+    re.S | re.X,
+)
+ESCAPE = re.compile(r"\\(.)|''", re.S)
+ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+
+
+def _unescape(text: str) -> str:
+    def replace(match):
+        if match[1] is None:  # '' inside a string
+            return "'"
+        return ESCAPES.get(match[1], match[1])
+
+    return ESCAPE.sub(replace, text) if "\\" in text or "''" in text else text
+
+
+def _number(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _row(text: str) -> Optional[tuple[list, int, str]]:
+    """
+    One "(v, v, ...)" tuple at the start of `text` -> (values, end, ","|";"),
+    or None when `text` stops mid-row (read more lines and try again).
+    """
+    values, pos, expect_value = [], 0, True
+    match = TOKEN.match(text, pos)
+    if match is None or match[4] != "(":
+        return None if not text.strip() else _error(text)
+    pos = match.end()
+    while True:
+        match = TOKEN.match(text, pos)
+        if match is None:
+            return None
+        pos = match.end()
+        if match[4] == ")":
+            break
+        if match[4] == ",":
+            expect_value = True
+            continue
+        if not expect_value:
+            _error(text)
+        if match[1] is not None:
+            values.append(_unescape(match[1]))
+        elif match[2]:
+            values.append(None)
+        elif match[3]:
+            values.append(_number(match[3]))
+        else:
+            _error(text)
+        expect_value = False
+
+    match = TOKEN.match(text, pos)
+    if match is None or match[4] not in (",", ";"):
+        return None if match is None else _error(text)
+    return values, match.end(), match[4]
+
+
+def _error(text: str):
+    raise ValueError(f"Unexpected dump syntax near: {text[:80]!r}")
+
+
+def dump_rows(path: str, tables: Iterable[str]) -> Iterator[tuple[str, dict]]:
+    """(table, {column: value}) for every row the dump inserts into `tables`."""
+    tables = set(tables)
+    table = columns = None
+    pending = ""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if table is None:
+                header = HEADER.match(line)
+                if header is None or header[1] not in tables:
+                    continue
+                table = header[1]
+                columns = [name.strip(" `") for name in header[2].split(",")]
+                line = header[3]
+
+            pending += line
+            while table is not None:
+                parsed = _row(pending)
+                if parsed is None:
+                    break  # row continues on the next line
+                values, end, terminator = parsed
+                yield table, dict(zip(columns, values))
+                pending = pending[end:]
+                if terminator == ";":
+                    table, pending = None, ""
@@ -0,0 +1,93 @@
+"""
+Recompute Product rating aggregates (rating_count, rating_sum, rating_1..5)
+from the rating table and fix the rows that drifted.
+
+    python -m src.scripts.reconcile_ratings            # fix
+    python -m src.scripts.reconcile_ratings --dry-run  # only report
+
+Also the backfill for products rated before the aggregates existed.
+"""
+
+import argparse
+
+from sqlalchemy import and_, func, literal, or_, select, update
+from sqlmodel import Session
+
+from src.lib.db_con import engine
+from src.api.models.productModel import RATING_SCORES, Product
+from src.api.models.ratingModel import Rating
+
+AGGREGATES = ["rating_count", "rating_sum", *[f"rating_{s}" for s in RATING_SCORES]]
+
+
+def rating_totals():
+    """Per product_id: the aggregates as they should be."""
+    return (
+        select(
+            Rating.product_id,
+            func.count().label("rating_count"),
+            func.sum(Rating.score).label("rating_sum"),
+            *[
+                func.count().filter(Rating.score == score).label(f"rating_{score}")
+                for score in RATING_SCORES
+            ],
+        )
+        .group_by(Rating.product_id)
+        .subquery()
+    )
+
+
+def reconcile_statements():
+    """
+    UPDATE ... FROM the grouped ratings for products that have ratings, and
+    a reset to zero for products that have none; both touch drifted rows only
+    and bump their updated_at (list/read ETags).
+    """
+    product = Product.__table__
+    totals = rating_totals()
+    drifted = or_(*[product.c[name] != totals.c[name] for name in AGGREGATES])
+    rated = (
+        update(product)
+        .where(and_(product.c.id == totals.c.product_id, drifted))
+        .values(
+            {name: totals.c[name] for name in AGGREGATES} | {"updated_at": func.now()}
+        )
+        .returning(product.c.id)
+    )
+    unrated = (
+        update(product)
+        .where(
+            ~select(literal(1)).where(Rating.product_id == product.c.id).exists(),
+            or_(*[product.c[name] != 0 for name in AGGREGATES]),
+        )
+        .values({name: 0 for name in AGGREGATES} | {"updated_at": func.now()})
+        .returning(product.c.id)
+    )
+    return rated, unrated
+
+
+def reconcile(session: Session, dry_run: bool = False) -> list[int]:
+    """Ids of the products whose aggregates were (or would be) corrected."""
+    fixed = []
+    for statement in reconcile_statements():
+        fixed.extend(session.exec(statement).scalars().all())
+    if dry_run:
+        session.rollback()
+    else:
+        session.commit()
+    return sorted(fixed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report, change nothing")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        fixed = reconcile(session, dry_run=args.dry_run)
+    action = "would fix" if args.dry_run else "fixed"
+    print(f"{action} {len(fixed)} product(s): {fixed[:50]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Put the stock of expired reservations (still held past expires_at) back on
+the products. /reservation/create only sweeps the holds on its basket's
+products; run this from cron (every minute or so) so every other expired
+hold comes back too.
+
+    python -m src.scripts.release_reservations
+"""
+
+from sqlmodel import Session
+
+from src.lib.db_con import engine
+from src.api.core.stock import expired_statement
+
+
+def release_expired(session: Session) -> tuple[list[int], list[int]]:
+    """(expired reservation ids, restocked product ids)"""
+    rows = session.exec(expired_statement()).all()
+    session.commit()
+    reservations = [row.id for row in rows if row.kind == "reservation"]
+    return reservations, [row.id for row in rows if row.kind == "product"]
+
+
+def main():
+    with Session(engine) as session:
+        reservations, products = release_expired(session)
+    print(
+        f"expired {len(reservations)} reservation(s), "
+        f"restocked {len(products)} product(s): {products[:50]}"
+    )
+
+
+if __name__ == "__main__":
+    main()